@@ -7,7 +7,7 @@ complete, balanced .adv adventure files from author style templates and story co
 
 import asyncio
 import os
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 from dotenv import load_dotenv
 from pydantic_ai import Agent, RunContext
@@ -42,6 +42,8 @@ class AdventureGenerationDependencies:
         self.tool_results: Dict[str, ToolResult] = {}
         self.streaming_enabled = True
         self.quality_threshold = 7.0
+        # Called with the number of steps drafted so far while streaming
+        self.progress_callback: Optional[Callable[[int], None]] = None
 
 
 def create_adventure_agent() -> Agent[AdventureGenerationDependencies, str]:
@@ -77,7 +79,8 @@ async def generate_adventure_from_files(
     story_file_path: str,
     output_file_path: Optional[str] = None,
     enable_streaming: bool = True,
-    quality_threshold: float = 7.0
+    quality_threshold: float = 7.0,
+    progress_callback: Optional[Callable[[int], None]] = None
 ) -> ToolResult:
     """
     Generate a complete adventure from author and story files.
@@ -88,6 +91,8 @@ async def generate_adventure_from_files(
         output_file_path: Optional path for output .adv file
         enable_streaming: Enable streaming output during generation
         quality_threshold: Minimum quality score for acceptance
+        progress_callback: Optional callback receiving the number of steps
+            drafted so far while the storyline streams
         
     Returns:
         ToolResult with generated adventure and metadata
@@ -104,7 +109,9 @@ async def generate_adventure_from_files(
         story = parse_story_content(story_content)
         
         # Generate adventure
-        result = await generate_adventure(author, story, enable_streaming, quality_threshold)
+        result = await generate_adventure(
+            author, story, enable_streaming, quality_threshold, progress_callback
+        )
         
         # Save to file if path provided and generation was successful
         if output_file_path and result.success:
@@ -128,7 +135,8 @@ async def generate_adventure(
     author: AuthorPersona,
     story: StoryRequirements,
     enable_streaming: bool = True,
-    quality_threshold: float = 7.0
+    quality_threshold: float = 7.0,
+    progress_callback: Optional[Callable[[int], None]] = None
 ) -> ToolResult:
     """
     Main adventure generation function using all 10 tools.
@@ -138,6 +146,8 @@ async def generate_adventure(
         story: Story requirements and constraints
         enable_streaming: Enable streaming output during generation
         quality_threshold: Minimum quality score for acceptance
+        progress_callback: Optional callback receiving the number of steps
+            drafted so far while the storyline streams
         
     Returns:
         ToolResult with generated adventure and comprehensive analysis
@@ -147,6 +157,7 @@ async def generate_adventure(
         deps = AdventureGenerationDependencies(author, story)
         deps.streaming_enabled = enable_streaming
         deps.quality_threshold = quality_threshold
+        deps.progress_callback = progress_callback
         
         # Create a simplified prompt for .adv format generation
         adventure_prompt = f"""
@@ -325,6 +336,10 @@ async def execute_generation_pipeline(
     
     if target_length > 15:
         storyline_result = await chunk_storyline_generation(author, story)
+    elif deps.streaming_enabled:
+        storyline_result = await _stream_storyline_with_progress(
+            author, story, deps.progress_callback
+        )
     else:
         storyline_result = await generate_storyline(author, story)
     
@@ -444,6 +459,23 @@ async def execute_generation_pipeline(
     return adventure
 
 
+async def _stream_storyline_with_progress(
+    author: AuthorPersona,
+    story: StoryRequirements,
+    on_progress: Optional[Callable[[int], None]] = None
+) -> ToolResult:
+    """Generate the storyline, reporting the drafted step count as steps stream in."""
+    if on_progress is None:
+        return await generate_storyline(author, story)
+    
+    def report(partial: AdventureGame) -> None:
+        on_progress(len(partial.steps))
+    
+    # Streaming goes through generate_storyline, so it shares the request
+    # deduplication, retries and rate limiting of a plain run
+    return await generate_storyline(author, story, on_partial=report)
+
+
 def _calculate_overall_quality(tool_results: Dict[str, ToolResult]) -> float:
     """Calculate overall quality score from tool results."""
     
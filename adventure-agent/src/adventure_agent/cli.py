@@ -81,13 +81,17 @@ def generate(
     ) as progress:
         task = progress.add_task("Generating adventure...", total=None)
         
+        def show_progress(steps: int) -> None:
+            progress.update(task, description=f"Generating adventure... {steps} steps drafted")
+        
         try:
             result = asyncio.run(generate_adventure_from_files(
                 author,
                 story,
                 output,
                 enable_streaming=not no_streaming,
-                quality_threshold=quality_threshold
+                quality_threshold=quality_threshold,
+                progress_callback=None if no_streaming else show_progress
             ))
             
             progress.update(task, completed=True)
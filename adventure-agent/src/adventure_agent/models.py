@@ -8,7 +8,7 @@ system, ensuring type safety and validation.
 from enum import Enum
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class AuthorPersona(BaseModel):
@@ -17,8 +17,11 @@ class AuthorPersona(BaseModel):
     
     This model captures the key characteristics that define how an author
     writes, including their voice, narrative style, and thematic elements.
+    It is frozen so a persona cannot be reassigned field by field.
     """
     
+    model_config = ConfigDict(frozen=True)
+    
     voice_and_tone: list[str] = Field(
         ..., 
         min_length=1,
@@ -44,6 +47,16 @@ class AuthorPersona(BaseModel):
         min_length=1,
         description="List of thematic elements the author explores"
     )
+    
+    @property
+    def primary_theme(self) -> str:
+        """Leading theme, or a generic fallback."""
+        return self.themes[0] if self.themes else "adventure"
+    
+    @property
+    def style_prefix(self) -> str:
+        """Top two voice and tone characteristics, comma-joined."""
+        return ", ".join(self.voice_and_tone[:2])
 
 
 class StoryRequirements(BaseModel):
@@ -52,8 +65,11 @@ class StoryRequirements(BaseModel):
     
     This model captures all the necessary information to generate a coherent
     adventure story that meets specific requirements.
+    It is frozen like AuthorPersona.
     """
     
+    model_config = ConfigDict(frozen=True)
+    
     setting: dict[str, str] = Field(
         ...,
         description="Setting details including time, place, environment"
@@ -79,6 +95,16 @@ class StoryRequirements(BaseModel):
         default_factory=dict,
         description="Technical constraints like length, number of endings"
     )
+    
+    @property
+    def npcs_by_name(self) -> dict[str, dict[str, str]]:
+        """NPCs indexed by name for direct lookup, skipping nameless entries."""
+        return {npc["name"]: npc for npc in self.npcs if npc.get("name")}
+    
+    @property
+    def branches_by_name(self) -> dict[str, dict[str, str]]:
+        """Story branches indexed by name for direct lookup, skipping nameless entries."""
+        return {branch["name"]: branch for branch in self.branches if branch.get("name")}
 
 
 class ChoiceLabel(str, Enum):
@@ -0,0 +1,153 @@
+"""
+Line-level markdown tokenizing shared by the .author and .story parsers.
+
+Line helpers inspect an already-stripped line using its first character and
+plain string operations. Section headers and the list items of a section
+are each matched in one regex scan so the per-line work runs inside the C
+regex engine.
+"""
+
+import re
+import unicodedata
+from collections.abc import Iterator
+
+# Control characters dropped from input; tabs become spaces, newlines stay
+_CONTROL_CHARS = {code: None for code in range(0x20)} | {
+    0x09: 0x20,
+    0x0A: 0x0A,
+    0x7F: None,
+}
+
+# A bullet (-, *, +) or numbered (1.) list item, capturing the item text
+_LIST_ITEM_RE = re.compile(r"^[^\S\n]*(?:[-*+]|\d+\.)[^\S\n]+(.+)$", re.MULTILINE)
+
+# A level 1 or 2 header line, possibly indented, capturing the header text
+_HEADER_RE = re.compile(r"^[^\S\n]*#{1,2}[^\S\n]+(\S.*?)[^\S\n]*$", re.MULTILINE)
+
+
+def normalize_text(content: str) -> str:
+    """
+    Put raw file content into canonical form before parsing.
+
+    Content is NFC-normalized so composed and decomposed accents compare
+    equal, then control characters are removed in a single translate pass.
+
+    Args:
+        content: Raw file content
+
+    Returns:
+        Normalized content
+    """
+    return unicodedata.normalize("NFC", content).translate(_CONTROL_CHARS)
+
+
+def list_items(text: str) -> list[str]:
+    """
+    Return the text of every bullet (-, *, +) or numbered (1.) list item.
+
+    Args:
+        text: Markdown text, usually the body of one section
+
+    Returns:
+        Stripped item texts in order, skipping items with no text
+    """
+    return [
+        item
+        for match in _LIST_ITEM_RE.findall(text)
+        if (item := match.strip())
+    ]
+
+
+def key_value(line: str) -> tuple[str, str] | None:
+    """
+    Split a Key: value line into its parts at the first colon.
+
+    A leading bullet marker and bold markers around the key are dropped, so
+    "Location: X", "- Name: description" and "- **Label**: value" all split.
+
+    Args:
+        line: Stripped line of markdown
+
+    Returns:
+        Tuple of (key, value), or None if the line has no key or no value
+    """
+    if line[:1] in ("-", "*", "+") and line[1:2].isspace():
+        line = line[1:]
+
+    key, sep, value = line.partition(":")
+    key = key.strip().strip("*").strip()
+    value = value.strip()
+    if not sep or not key or not value:
+        return None
+
+    return key, value
+
+
+def iter_lines(text: str) -> Iterator[str]:
+    """
+    Yield the lines of text one at a time without building a list of them.
+
+    Args:
+        text: Text to split on newlines
+
+    Yields:
+        Each line, without its trailing newline
+    """
+    start = 0
+    length = len(text)
+    while start < length:
+        end = text.find("\n", start)
+        if end < 0:
+            end = length
+        yield text[start:end]
+        start = end + 1
+
+
+def split_sections(content: str) -> Iterator[tuple[str, str]]:
+    """
+    Split markdown content into (header, body) pairs at level 1 or 2 headers.
+
+    Header lines are found in one regex scan and bodies are sliced out
+    between them, so body lines are never visited one at a time. Text
+    before the first header is dropped, and hash lines that are not level
+    1 or 2 headers stay in the body.
+
+    Args:
+        content: Raw markdown content
+
+    Yields:
+        Tuple of (header text, raw body text) for each header in order
+    """
+    headers = list(_HEADER_RE.finditer(content))
+    for match, following in zip(headers, headers[1:] + [None]):
+        body_end = following.start() if following is not None else len(content)
+        yield match.group(1), content[match.end() + 1:body_end]
+
+
+def pick_sections(content: str, section_map: dict[str, str]) -> dict[str, str]:
+    """
+    Choose the body for each field from content's known sections.
+
+    A repeated header replaces the earlier one. When several headers alias
+    one field, the first in section_map order with a non-empty body wins.
+
+    Args:
+        content: Raw markdown content
+        section_map: Casefolded headers mapped to field names, in priority order
+
+    Returns:
+        Dict mapping field names to their stripped section body
+    """
+    bodies = {
+        key: body
+        for header, body in split_sections(content)
+        if (key := header.casefold()) in section_map
+    }
+
+    fields: dict[str, str] = {}
+    for key, field in section_map.items():
+        body = bodies.get(key, "").strip()
+        if body and field not in fields:
+            fields[field] = body
+
+    return fields
@@ -5,10 +5,32 @@ This module handles parsing of markdown-formatted .author files that contain
 author persona information including voice, tone, narrative style, and themes.
 """
 
+import functools
 import re
+import sys
 from pathlib import Path
 
 from ..models import AuthorPersona
+from ._markdown import list_items, normalize_text, pick_sections
+
+_BOLD_RE = re.compile(r"\*\*(.*?)\*\*")
+_ITALIC_RE = re.compile(r"\*(.*?)\*")
+_CODE_RE = re.compile(r"`(.*?)`")
+
+# Casefolded section headers mapped to the AuthorPersona field they fill,
+# with aliases of one field listed in priority order
+_SECTION_MAP = {
+    sys.intern(header.casefold()): sys.intern(field)
+    for header, field in {
+        "voice and tone": "voice_and_tone",
+        "narrative style": "narrative_style",
+        "discworld elements to include": "world_elements",
+        "world elements": "world_elements",
+        "character development": "character_development",
+        "themes to explore": "themes",
+        "themes": "themes",
+    }.items()
+}
 
 
 def parse_author_file(file_path: str) -> AuthorPersona:
@@ -40,6 +62,10 @@ def parse_author_content(content: str) -> AuthorPersona:
     """
     Parse author content from string and return AuthorPersona model.
     
+    The extracted fields are cached by content, so re-parsing an unchanged
+    file skips the markdown work. Each call still validates a new model,
+    which copies the cached lists, so callers never share mutable state.
+    
     Args:
         content: Raw content of .author file
         
@@ -49,21 +75,23 @@ def parse_author_content(content: str) -> AuthorPersona:
     Raises:
         ValueError: If required sections are missing
     """
-    # Extract sections using regex patterns
-    sections = _extract_sections(content)
-    
-    # Parse each section into lists
-    voice_and_tone = _parse_list_section(sections.get("voice and tone", ""))
-    narrative_style = _parse_list_section(sections.get("narrative style", ""))
-    world_elements = _parse_list_section(
-        sections.get("discworld elements to include", "") or 
-        sections.get("world elements", "")
-    )
-    character_development = _parse_list_section(sections.get("character development", ""))
-    themes = _parse_list_section(
-        sections.get("themes to explore", "") or 
-        sections.get("themes", "")
-    )
+    return AuthorPersona(**_persona_fields(content))
+
+
+@functools.lru_cache(maxsize=256)
+def _persona_fields(content: str) -> dict[str, list[str]]:
+    """Extract and validate the AuthorPersona fields of an author file."""
+    # Canonicalize Unicode and drop control characters once up front
+    content = normalize_text(content)
+    
+    # Collect list items for each known section in a single pass
+    fields = _extract_fields(content)
+    
+    voice_and_tone = fields.get("voice_and_tone", [])
+    narrative_style = fields.get("narrative_style", [])
+    world_elements = fields.get("world_elements", [])
+    character_development = fields.get("character_development", [])
+    themes = fields.get("themes", [])
     
     # Validate required sections
     if not voice_and_tone:
@@ -79,83 +107,44 @@ def parse_author_content(content: str) -> AuthorPersona:
     if not world_elements:
         world_elements = ["fantasy setting", "rich world-building"]
     
-    return AuthorPersona(
-        voice_and_tone=voice_and_tone,
-        narrative_style=narrative_style,
-        world_elements=world_elements,
-        character_development=character_development,
-        themes=themes,
-    )
+    return {
+        "voice_and_tone": voice_and_tone,
+        "narrative_style": narrative_style,
+        "world_elements": world_elements,
+        "character_development": character_development,
+        "themes": themes,
+    }
 
 
-def _extract_sections(content: str) -> dict[str, str]:
+def _extract_fields(content: str) -> dict[str, list[str]]:
     """
-    Extract markdown sections from content.
+    Extract list items for each known section from markdown content.
     
     Args:
         content: Raw markdown content
         
     Returns:
-        Dict mapping section names to their content
+        Dict mapping AuthorPersona field names to their list items; fields
+        without any items are left out
     """
-    sections = {}
-    current_section = None
-    current_content: list[str] = []
-    
-    lines = content.split("\n")
-    
-    for line in lines:
-        # Check if this is a section header (# Header or ## Header)
-        header_match = re.match(r"^#{1,2}\s+(.+)$", line.strip())
-        if header_match:
-            # Save previous section if it exists
-            if current_section:
-                sections[current_section.lower()] = "\n".join(current_content).strip()
-            
-            # Start new section
-            current_section = header_match.group(1)
-            current_content = []
-        else:
-            # Add content to current section
-            if current_section:
-                current_content.append(line)
+    fields: dict[str, list[str]] = {}
     
-    # Save the last section
-    if current_section:
-        sections[current_section.lower()] = "\n".join(current_content).strip()
+    for field, body in pick_sections(content, _SECTION_MAP).items():
+        items = list_items(body)
+        if items:
+            fields[field] = list(map(_clean_item, items))
     
-    return sections
+    return fields
 
 
-def _parse_list_section(section_content: str) -> list[str]:
-    """
-    Parse a section containing bullet points into a list.
-    
-    Args:
-        section_content: Raw section content with bullet points
-        
-    Returns:
-        List of cleaned bullet point items
-    """
-    if not section_content.strip():
-        return []
-    
-    items = []
-    lines = section_content.split("\n")
-    
-    for line in lines:
-        line = line.strip()
-        # Match bullet points (-, *, +)
-        bullet_match = re.match(r"^[-*+]\s+(.+)$", line)
-        if bullet_match:
-            item = bullet_match.group(1).strip()
-            # Clean up formatting
-            item = re.sub(r"\*\*(.*?)\*\*", r"\1", item)  # Remove bold
-            item = re.sub(r"\*(.*?)\*", r"\1", item)  # Remove italics
-            item = re.sub(r"`(.*?)`", r"\1", item)  # Remove code formatting
-            items.append(item)
-    
-    return items
+def _clean_item(item: str) -> str:
+    """Strip markdown bold, italic and code formatting from a list item."""
+    if "*" in item:
+        item = _BOLD_RE.sub(r"\1", item)
+        item = _ITALIC_RE.sub(r"\1", item)
+    if "`" in item:
+        item = _CODE_RE.sub(r"\1", item)
+    return item
 
 
 def validate_author_file(file_path: str) -> tuple[bool, list[str]]:
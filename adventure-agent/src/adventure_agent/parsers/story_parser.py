@@ -5,10 +5,39 @@ This module handles parsing of markdown-formatted .story files that contain
 story requirements including setting, characters, plot, and technical constraints.
 """
 
+import functools
 import re
+import sys
+from collections.abc import Callable
 from pathlib import Path
+from typing import Any
 
 from ..models import StoryRequirements
+from ._markdown import iter_lines, key_value, list_items, normalize_text, pick_sections
+
+# A ", key: value" attribute trailing an entry's description
+_ATTRIBUTE_SPLIT_RE = re.compile(r",\s*(?=\w+:)")
+_NUMBER_RE = re.compile(r"(\d+)")
+_BOLD_RE = re.compile(r"\*\*(.*?)\*\*")
+_ITALIC_RE = re.compile(r"\*(.*?)\*")
+
+# Casefolded section headers mapped to the StoryRequirements field they fill,
+# with aliases of one field listed in priority order
+_SECTION_MAP = {
+    sys.intern(header.casefold()): sys.intern(field)
+    for header, field in {
+        "setting and location": "setting",
+        "setting": "setting",
+        "main character": "main_character",
+        "core mystery/plot": "plot",
+        "plot": "plot",
+        "key npcs to include": "npcs",
+        "npcs": "npcs",
+        "story branches and choices": "branches",
+        "branches": "branches",
+        "technical requirements": "technical_requirements",
+    }.items()
+}
 
 
 def parse_story_file(file_path: str) -> StoryRequirements:
@@ -40,6 +69,11 @@ def parse_story_content(content: str) -> StoryRequirements:
     """
     Parse story content from string and return StoryRequirements model.
     
+    The extracted fields are cached by content, so re-parsing an unchanged
+    file skips the markdown work. Each call still validates a new model,
+    which copies the cached dicts and lists, so callers never share
+    mutable state.
+    
     Args:
         content: Raw content of .story file
         
@@ -49,82 +83,85 @@ def parse_story_content(content: str) -> StoryRequirements:
     Raises:
         ValueError: If required sections are missing
     """
-    # Extract sections using regex patterns
-    sections = _extract_sections(content)
-    
-    # Parse setting information
-    setting = _parse_setting_section(sections.get("setting and location", ""))
-    
-    # Parse main character
-    main_character = _parse_main_character_section(sections.get("main character", ""))
-    
-    # Parse plot
-    plot = _parse_plot_section(sections.get("core mystery/plot", "") or sections.get("plot", ""))
-    
-    # Parse NPCs
-    npcs = _parse_npcs_section(sections.get("key npcs to include", "") or sections.get("npcs", ""))
+    return StoryRequirements(**_requirement_fields(content))
+
+
+@functools.lru_cache(maxsize=256)
+def _requirement_fields(content: str) -> dict[str, Any]:
+    """Extract and validate the StoryRequirements fields of a story file."""
+    # Canonicalize Unicode and drop control characters once up front
+    content = normalize_text(content)
     
-    # Parse branches
-    branches = _parse_branches_section(sections.get("story branches and choices", "") or sections.get("branches", ""))
+    # Split content into known sections in a single pass
+    sections = pick_sections(content, _SECTION_MAP)
     
-    # Parse technical requirements
-    technical_requirements = _parse_technical_requirements(sections.get("technical requirements", ""))
+    # Parse each field with its section handler
+    fields: dict[str, Any] = {
+        field: parse(sections.get(field, ""))
+        for field, parse in _SECTION_PARSERS.items()
+    }
     
     # Validate required fields
-    if not setting:
+    if not fields["setting"]:
         raise ValueError("Missing or empty 'Setting and Location' section")
-    if not main_character:
+    if not fields["main_character"]:
         raise ValueError("Missing or empty 'Main Character' section")
-    if not plot:
+    if not fields["plot"]:
         raise ValueError("Missing or empty plot section")
     
-    return StoryRequirements(
-        setting=setting,
-        main_character=main_character,
-        plot=plot,
-        npcs=npcs,
-        branches=branches,
-        technical_requirements=technical_requirements,
-    )
+    return fields
 
 
-def _extract_sections(content: str) -> dict[str, str]:
+def _key_values(section_content: str) -> dict[str, str]:
     """
-    Extract markdown sections from content.
+    Collect Key: value lines, bulleted or not, into a dict.
     
     Args:
-        content: Raw markdown content
+        section_content: Raw section content
         
     Returns:
-        Dict mapping section names to their content
+        Dict mapping snake_case keys to their values
     """
-    sections = {}
-    current_section = None
-    current_content: list[str] = []
-    
-    lines = content.split("\n")
-    
-    for line in lines:
-        # Check if this is a section header (# Header or ## Header)
-        header_match = re.match(r"^#{1,2}\s+(.+)$", line.strip())
-        if header_match:
-            # Save previous section if it exists
-            if current_section:
-                sections[current_section.lower()] = "\n".join(current_content).strip()
-            
-            # Start new section
-            current_section = header_match.group(1)
-            current_content = []
-        else:
-            # Add content to current section
-            if current_section:
-                current_content.append(line)
+    pairs = (key_value(line.strip()) for line in iter_lines(section_content))
+    return {_field_key(key): value for key, value in filter(None, pairs)}
+
+
+def _named_entries(section_content: str, defaults: dict[str, str]) -> list[dict[str, str]]:
+    """
+    Parse list items (- Name: description, key: value) into entry dicts.
     
-    # Save the last section
-    if current_section:
-        sections[current_section.lower()] = "\n".join(current_content).strip()
+    Trailing ", key: value" attributes are split off the description and
+    override the given defaults.
+    
+    Args:
+        section_content: Raw section content
+        defaults: Fields every entry starts with
+        
+    Returns:
+        List of dicts with name, description and any attributes
+    """
+    entries: list[dict[str, str]] = []
     
-    return sections
+    for item in list_items(section_content):
+        pair = key_value(item)
+        if pair is None:
+            continue
+        
+        name, rest = pair
+        description, *attributes = _ATTRIBUTE_SPLIT_RE.split(rest)
+        entry = {"name": name, "description": description, **defaults}
+        for attribute in attributes:
+            key, _, value = attribute.partition(":")
+            entry[_field_key(key)] = value.strip()
+        entries.append(entry)
+    
+    return entries
+
+
+@functools.lru_cache(maxsize=256)
+def _field_key(label: str) -> str:
+    """Return the interned snake_case dict key for a section label."""
+    return sys.intern(label.lower().replace(" ", "_"))
 
 
 def _parse_setting_section(section_content: str) -> dict[str, str]:
@@ -137,21 +174,10 @@ def _parse_setting_section(section_content: str) -> dict[str, str]:
     Returns:
         Dict with setting details
     """
-    setting = {}
-    
     if not section_content.strip():
         return {"location": "unspecified", "time": "present day"}
     
-    lines = section_content.split("\n")
-    
-    for line in lines:
-        line = line.strip()
-        # Match bullet points with bold labels
-        bullet_match = re.match(r"^[-*+]\s+\*\*(.*?)\*\*:\s*(.+)$", line)
-        if bullet_match:
-            key = bullet_match.group(1).lower().replace(" ", "_")
-            value = bullet_match.group(2).strip()
-            setting[key] = value
+    setting = _key_values(section_content)
     
     # Ensure we have at least location and time
     if "primary_location" in setting:
@@ -177,21 +203,10 @@ def _parse_main_character_section(section_content: str) -> dict[str, str]:
     Returns:
         Dict with character details
     """
-    character = {}
-    
     if not section_content.strip():
         return {"background": "unknown", "motivation": "adventure"}
     
-    lines = section_content.split("\n")
-    
-    for line in lines:
-        line = line.strip()
-        # Match bullet points with bold labels
-        bullet_match = re.match(r"^[-*+]\s+\*\*(.*?)\*\*:\s*(.+)$", line)
-        if bullet_match:
-            key = bullet_match.group(1).lower().replace(" ", "_")
-            value = bullet_match.group(2).strip()
-            character[key] = value
+    character = _key_values(section_content)
     
     # Ensure we have basic character info
     if "protagonist" in character:
@@ -226,8 +241,8 @@ def _parse_plot_section(section_content: str) -> str:
     if paragraphs:
         plot = paragraphs[0]
         # Remove markdown formatting
-        plot = re.sub(r"\*\*(.*?)\*\*", r"\1", plot)
-        plot = re.sub(r"\*(.*?)\*", r"\1", plot)
+        plot = _BOLD_RE.sub(r"\1", plot)
+        plot = _ITALIC_RE.sub(r"\1", plot)
         return plot
     
     return "A mysterious adventure unfolds."
@@ -243,27 +258,10 @@ def _parse_npcs_section(section_content: str) -> list[dict[str, str]]:
     Returns:
         List of NPC dictionaries
     """
-    npcs: list[dict[str, str]] = []
-    
     if not section_content.strip():
-        return npcs
-    
-    lines = section_content.split("\n")
+        return []
     
-    for line in lines:
-        line = line.strip()
-        # Match bullet points with bold character names and descriptions
-        bullet_match = re.match(r"^[-*+]\s+\*\*(.*?)\*\*:\s*(.+)$", line)
-        if bullet_match:
-            name = bullet_match.group(1).strip()
-            description = bullet_match.group(2).strip()
-            npcs.append({
-                "name": name,
-                "description": description,
-                "role": "supporting character"
-            })
-    
-    return npcs
+    return _named_entries(section_content, {"role": "supporting character"})
 
 
 def _parse_branches_section(section_content: str) -> list[dict[str, str]]:
@@ -276,31 +274,10 @@ def _parse_branches_section(section_content: str) -> list[dict[str, str]]:
     Returns:
         List of branch dictionaries
     """
-    branches: list[dict[str, str]] = []
-    
     if not section_content.strip():
-        return branches
+        return []
     
-    # Split by numbered items (1., 2., 3.)
-    numbered_sections = re.split(r"\n\d+\.\s+", section_content)
-    
-    for i, section in enumerate(numbered_sections):
-        if not section.strip():
-            continue
-            
-        # Extract the path name (usually in bold)
-        path_match = re.search(r"\*\*(.*?Path)\*\*:\s*(.+)", section)
-        if path_match:
-            path_name = path_match.group(1)
-            description = path_match.group(2)
-            
-            branches.append({
-                "name": path_name,
-                "description": description,
-                "type": "major_branch"
-            })
-    
-    return branches
+    return _named_entries(section_content, {"type": "major_branch"})
 
 
 def _parse_technical_requirements(section_content: str) -> dict[str, str | int | list[str]]:
@@ -318,22 +295,13 @@ def _parse_technical_requirements(section_content: str) -> dict[str, str | int |
     if not section_content.strip():
         return {"length": 10, "endings": 3}
     
-    lines = section_content.split("\n")
-    
-    for line in lines:
-        line = line.strip()
-        # Match bullet points with bold labels
-        bullet_match = re.match(r"^[-*+]\s+\*\*(.*?)\*\*:\s*(.+)$", line)
-        if bullet_match:
-            key = bullet_match.group(1).lower().replace(" ", "_")
-            value_str = bullet_match.group(2).strip()
-            
-            # Try to parse numbers
-            number_match = re.search(r"(\d+)", value_str)
-            if number_match and key in ["length", "endings", "steps"]:
-                requirements[key] = int(number_match.group(1))
-            else:
-                requirements[key] = value_str
+    for key, value_str in _key_values(section_content).items():
+        # Try to parse numbers
+        number_match = _NUMBER_RE.search(value_str)
+        if number_match and key in ["length", "endings", "steps"]:
+            requirements[key] = int(number_match.group(1))
+        else:
+            requirements[key] = value_str
     
     # Set defaults
     if "length" not in requirements:
@@ -344,6 +312,17 @@ def _parse_technical_requirements(section_content: str) -> dict[str, str | int |
     return requirements
 
 
+# StoryRequirements field names mapped to the parser for their section
+_SECTION_PARSERS: dict[str, Callable[[str], Any]] = {
+    "setting": _parse_setting_section,
+    "main_character": _parse_main_character_section,
+    "plot": _parse_plot_section,
+    "npcs": _parse_npcs_section,
+    "branches": _parse_branches_section,
+    "technical_requirements": _parse_technical_requirements,
+}
+
+
 def validate_story_file(file_path: str) -> tuple[bool, list[str]]:
     """
     Validate a .story file and return validation results.
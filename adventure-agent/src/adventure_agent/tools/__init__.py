@@ -3,6 +3,7 @@
 from .storyline_generator import (
     generate_storyline,
     chunk_storyline_generation,
+    generate_endings,
 )
 from .character_tracker import (
     track_characters,
@@ -16,6 +17,7 @@ from .inventory_integrator import (
 __all__ = [
     "generate_storyline",
     "chunk_storyline_generation", 
+    "generate_endings",
     "track_characters",
     "enhance_character_consistency",
     "integrate_inventory",
@@ -5,13 +5,20 @@ This tool validates generated .adv files against the JavaScript parser requireme
 ensuring syntactic correctness and structural integrity for the game engine.
 """
 
+import functools
 import re
+from collections import Counter
 from typing import Dict, List, Set, Tuple
 
 from pydantic_ai import Agent, RunContext
 
 from ..models import AdventureGame, Choice, ChoiceLabel, ToolResult
 
+# Choice line syntax matching the JavaScript parser
+_CHOICE_RE = re.compile(
+    r'^([A-D])\)\s*(.+?)\s*(?:->|→)\s*(STEP_\d+|ENDING_SUCCESS|ENDING_FAILURE|ENDING_NEUTRAL)(?:\s*\{\s*(.+?)\s*\})?$'
+)
+
 
 class ValidationError:
     """Represents a validation error with details."""
@@ -34,6 +41,8 @@ class ValidationDependencies:
         self.errors: List[ValidationError] = []
         self.warnings: List[ValidationError] = []
         self.strict_mode = True
+        # Step ids not reachable from step 1, filled by _validate_story_flow
+        self.unreachable_steps: Set[str] = set()
 
 
 def create_validator_agent() -> Agent[ValidationDependencies, Dict[str, bool]]:
@@ -82,7 +91,7 @@ async def validate_adv_format(adventure: AdventureGame) -> ToolResult:
         await _validate_key_value_sections(adventure, deps)
         
         # Validate story flow integrity
-        await _validate_story_flow(adventure, deps)
+        await _validate_story_flow(adventure, _step_links(adventure), deps)
         
         # Compile results
         has_errors = len(deps.errors) > 0
@@ -99,6 +108,7 @@ async def validate_adv_format(adventure: AdventureGame) -> ToolResult:
                 "warnings": [str(w) for w in deps.warnings],
                 "error_count": len(deps.errors),
                 "warning_count": len(deps.warnings),
+                "unreachable_steps": sorted(deps.unreachable_steps),
                 "validation_summary": issues_summary
             },
             message=f"Validation {'passed' if not has_errors else 'failed'}: {len(deps.errors)} errors, {len(deps.warnings)} warnings",
@@ -247,7 +257,15 @@ async def _validate_choices(adventure: AdventureGame, deps: ValidationDependenci
     for step_id, step in adventure.steps.items():
         step_location = f"STEP_{step_id}"
         
-        choice_labels_used = set()
+        # Count labels in one pass and report each duplicated label once
+        label_counts = Counter(choice.label for choice in step.choices if choice.label)
+        for label, count in label_counts.items():
+            if count > 1:
+                deps.errors.append(ValidationError(
+                    "DUPLICATE_CHOICE_LABEL",
+                    f"Duplicate choice label '{label}' used {count} times in step",
+                    step_location
+                ))
         
         for i, choice in enumerate(step.choices):
             choice_location = f"{step_location}.CHOICE_{i+1}"
@@ -267,15 +285,6 @@ async def _validate_choices(adventure: AdventureGame, deps: ValidationDependenci
                         f"Choice label '{choice.label}' is not valid (must be A, B, C, or D)",
                         choice_location
                     ))
-                
-                # Check for duplicate labels
-                if choice.label in choice_labels_used:
-                    deps.errors.append(ValidationError(
-                        "DUPLICATE_CHOICE_LABEL",
-                        f"Duplicate choice label '{choice.label}' in step",
-                        choice_location
-                    ))
-                choice_labels_used.add(choice.label)
             
             # Validate choice description
             if not choice.description or not choice.description.strip():
@@ -465,8 +474,24 @@ async def _validate_key_value_dict(section_name: str, data: Dict, deps: Validati
             ))
 
 
-async def _validate_story_flow(adventure: AdventureGame, deps: ValidationDependencies):
-    """Validate story flow and reachability."""
+def _step_links(adventure: AdventureGame) -> Dict[str, List[str]]:
+    """Map each step id to the step ids its choices lead to."""
+    return {
+        step_id: [
+            choice.target.replace("STEP_", "")
+            for choice in step.choices
+            if choice.target.startswith("STEP_")
+        ]
+        for step_id, step in adventure.steps.items()
+    }
+
+
+async def _validate_story_flow(
+    adventure: AdventureGame,
+    step_links: Dict[str, List[str]],
+    deps: ValidationDependencies
+):
+    """Validate story flow and reachability along the given step links."""
     
     # Find all reachable steps
     reachable_steps = set()
@@ -479,17 +504,12 @@ async def _validate_story_flow(adventure: AdventureGame, deps: ValidationDepende
         
         reachable_steps.add(current_step)
         
-        if current_step in adventure.steps:
-            step = adventure.steps[current_step]
-            for choice in step.choices:
-                if choice.target.startswith("STEP_"):
-                    target_step = choice.target.replace("STEP_", "")
-                    if target_step not in reachable_steps:
-                        steps_to_check.add(target_step)
+        for target_step in step_links.get(current_step, ()):
+            if target_step not in reachable_steps:
+                steps_to_check.add(target_step)
     
     # Check for unreachable steps
-    all_steps = set(adventure.steps.keys())
-    unreachable_steps = all_steps - reachable_steps
+    unreachable_steps = deps.unreachable_steps = adventure.steps.keys() - reachable_steps
     
     if unreachable_steps:
         deps.warnings.append(ValidationError(
@@ -518,10 +538,13 @@ async def validate_choice_syntax(choice_text: str) -> bool:
     Returns:
         True if syntax is valid
     """
-    # Regex pattern matching the JavaScript parser
-    pattern = r'^([A-D])\)\s*(.+?)\s*(?:->|→)\s*(STEP_\d+|ENDING_SUCCESS|ENDING_FAILURE|ENDING_NEUTRAL)(?:\s*\{\s*(.+?)\s*\})?$'
-    
-    return bool(re.match(pattern, choice_text.strip()))
+    return _is_valid_choice(choice_text.strip())
+
+
+@functools.lru_cache(maxsize=1024)
+def _is_valid_choice(choice_text: str) -> bool:
+    """Match stripped choice text against the parser syntax, caching results."""
+    return _CHOICE_RE.match(choice_text) is not None
 
 
 async def generate_validation_report(adventure: AdventureGame) -> str:
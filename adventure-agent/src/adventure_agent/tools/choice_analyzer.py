@@ -5,12 +5,17 @@ This tool verifies that choices lead to meaningfully different outcomes,
 validates choice descriptions and consequences, and scores choice impact and player agency.
 """
 
+import functools
 from typing import Dict, List, Set, Tuple
 
 from pydantic_ai import Agent, RunContext
 
 from ..models import AdventureGame, Choice, ToolResult
 
+# Impact added per consequence/condition count, capped at 0.3 and 0.2
+_CONSEQUENCE_IMPACT = tuple(min(0.3, count * 0.1) for count in range(4))
+_CONDITION_IMPACT = tuple(min(0.2, count * 0.05) for count in range(5))
+
 
 class ChoiceImpactAnalysis:
     """Analysis of choice impact and consequences."""
@@ -169,38 +174,39 @@ def _calculate_choice_impact_scores(adventure: AdventureGame) -> Dict[str, float
     impact_scores = {}
     
     for step_id, step in adventure.steps.items():
-        for i, choice in enumerate(step.choices):
-            choice_key = f"STEP_{step_id}.CHOICE_{i+1}"
-            
+        key_prefix = f"STEP_{step_id}.CHOICE_"
+        for i, choice in enumerate(step.choices, 1):
             # Calculate impact based on multiple factors
             impact_score = 0.0
             
             # 1. Target impact (where does it lead?)
-            if choice.target.startswith("ENDING_"):
-                impact_score += 0.4  # High impact - direct ending
-            elif choice.target.startswith("STEP_"):
-                # Medium impact - leads to another step
-                impact_score += 0.2
+            impact_score += _target_impact(choice.target)
             
             # 2. Consequence impact
-            if choice.consequences:
-                impact_score += min(0.3, len(choice.consequences) * 0.1)
+            impact_score += _CONSEQUENCE_IMPACT[min(len(choice.consequences), 3)]
             
             # 3. Condition complexity
-            if choice.conditions:
-                impact_score += min(0.2, len(choice.conditions) * 0.05)
+            impact_score += _CONDITION_IMPACT[min(len(choice.conditions), 4)]
             
             # 4. Description quality/complexity
-            description_length = len(choice.description.strip())
-            if description_length > 20:
+            if len(choice.description.strip()) > 20:
                 impact_score += 0.1
             
             # Normalize to 0-1 scale
-            impact_scores[choice_key] = min(1.0, impact_score)
+            impact_scores[f"{key_prefix}{i}"] = min(1.0, impact_score)
     
     return impact_scores
 
 
+def _target_impact(target: str) -> float:
+    """Impact of where a choice leads: an ending is high, another step medium."""
+    if target.startswith("ENDING_"):
+        return 0.4
+    if target.startswith("STEP_"):
+        return 0.2
+    return 0.0
+
+
 def _calculate_choice_differentiation(adventure: AdventureGame) -> Dict[str, float]:
     """Calculate how different choices are within each step."""
     
@@ -214,25 +220,20 @@ def _calculate_choice_differentiation(adventure: AdventureGame) -> Dict[str, flo
                 differentiation_scores[choice_key] = 0.5
             continue
         
-        # Compare each choice with others in the same step
-        for i, choice in enumerate(step.choices):
-            choice_key = f"STEP_{step_id}.CHOICE_{i+1}"
-            
-            total_difference = 0.0
-            comparisons = 0
-            
-            for j, other_choice in enumerate(step.choices):
-                if i != j:
-                    # Calculate difference between choices
-                    difference = _calculate_choice_difference(choice, other_choice)
-                    total_difference += difference
-                    comparisons += 1
-            
-            if comparisons > 0:
-                avg_difference = total_difference / comparisons
-                differentiation_scores[choice_key] = avg_difference
-            else:
-                differentiation_scores[choice_key] = 0.5
+        # Differences are symmetric, so score each pair once and reuse it
+        choices = step.choices
+        count = len(choices)
+        differences = [[0.0] * count for _ in range(count)]
+        for i in range(count):
+            for j in range(i + 1, count):
+                differences[i][j] = differences[j][i] = _calculate_choice_difference(
+                    choices[i], choices[j]
+                )
+        
+        # Average each choice's difference from the others in the same step
+        key_prefix = f"STEP_{step_id}.CHOICE_"
+        for i, row in enumerate(differences, 1):
+            differentiation_scores[f"{key_prefix}{i}"] = sum(row) / (count - 1)
     
     return differentiation_scores
 
@@ -266,8 +267,8 @@ def _calculate_choice_difference(choice1: Choice, choice2: Choice) -> float:
 def _calculate_text_similarity(text1: str, text2: str) -> float:
     """Calculate similarity between two text strings."""
     
-    words1 = set(text1.lower().split())
-    words2 = set(text2.lower().split())
+    words1 = _word_set(text1)
+    words2 = _word_set(text2)
     
     if not words1 and not words2:
         return 1.0
@@ -281,6 +282,12 @@ def _calculate_text_similarity(text1: str, text2: str) -> float:
     return len(intersection) / len(union) if union else 0.0
 
 
+@functools.lru_cache(maxsize=1024)
+def _word_set(text: str) -> frozenset[str]:
+    """Lowercased word set of a text, built once per distinct string."""
+    return frozenset(text.lower().split())
+
+
 def _calculate_list_similarity(list1: List[str], list2: List[str]) -> float:
     """Calculate similarity between two lists of strings."""
     
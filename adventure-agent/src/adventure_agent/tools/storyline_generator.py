@@ -6,28 +6,88 @@ personas and story requirements into branching adventure narratives.
 """
 
 import asyncio
-from typing import Dict, List
+import functools
+import hashlib
+import random
+import re
+from typing import Callable, Dict, List, Tuple, TypeVar
 
-from pydantic_ai import Agent, RunContext
+from pydantic_ai import Agent
+from pydantic_ai.exceptions import ModelHTTPError
+from pydantic_core import to_json
 
 from ..models import (
     AdventureGame,
     AuthorPersona,
-    Choice,
-    ChoiceLabel,
     EndingType,
     StoryRequirements,
     StoryStep,
     ToolResult,
 )
 
+OutputT = TypeVar("OutputT")
+
+# Reusable step ID keys for reassembling chunked adventures
+_STEP_IDS = tuple(str(i) for i in range(1, 1001))
+
+# Upper bound on chunk requests in flight against the model provider
+MAX_CONCURRENT_CHUNKS = 8
+
+# Provider request budget for the agent runs of one chunked generation
+MAX_REQUESTS_PER_MINUTE = 500
+
+# In-flight generate_storyline calls keyed by their inputs, so concurrent
+# requests for the same adventure share one model run
+_inflight: Dict[str, asyncio.Future[ToolResult]] = {}
+
+# Retry policy for transient model provider errors (rate limits, 5xx)
+MAX_RUN_ATTEMPTS = 5
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+
+
+class ChunkGenerationError(Exception):
+    """Raised when one chunk of a chunked generation fails."""
+    
+    def __init__(self, result: ToolResult):
+        self.result = result
+        super().__init__(result.message)
+
+
+class RequestRateLimiter:
+    """Space out requests so at most max_per_minute start in any minute."""
+    
+    def __init__(self, max_per_minute: int):
+        self._interval = 60.0 / max_per_minute
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self) -> None:
+        """Wait until the next request slot is available."""
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            wait = self._next_start - now
+            self._next_start = max(now, self._next_start) + self._interval
+        
+        if wait > 0:
+            await asyncio.sleep(wait)
+
 
 class StorylineDependencies:
     """Dependencies for the storyline generator."""
     
-    def __init__(self, author: AuthorPersona, story: StoryRequirements):
+    __slots__ = ("author", "story", "setting_location", "limiter")
+    
+    def __init__(
+        self,
+        author: AuthorPersona,
+        story: StoryRequirements,
+        limiter: RequestRateLimiter | None = None
+    ):
         self.author = author
         self.story = story
+        self.setting_location = story.setting.get("location")
+        self.limiter = limiter
 
 
 def create_storyline_agent() -> Agent[StorylineDependencies, AdventureGame]:
@@ -39,99 +99,49 @@ def create_storyline_agent() -> Agent[StorylineDependencies, AdventureGame]:
         system_prompt=(
             "You are an expert adventure story generator. Create complete branching "
             "narratives that match the author's style and story requirements. "
-            "Generate engaging adventures with meaningful choices and consequences."
+            "Generate engaging adventures with meaningful choices and consequences. "
+            "Return the whole adventure in a single response: every story step with "
+            "its narrative and choices, plus every requested ending."
         ),
     )
 
 
-# Note: Tool decorators will be applied when agent is created
-async def generate_story_steps(
-    ctx: RunContext[StorylineDependencies], 
-    target_length: int,
-    branching_factor: int = 2
-) -> List[StoryStep]:
-    """
-    Generate the core story steps for the adventure.
+@functools.lru_cache(maxsize=1)
+def _storyline_agent() -> Agent[StorylineDependencies, AdventureGame]:
+    """Return the shared storyline agent, creating it on first use.
     
-    Args:
-        ctx: Agent context with author and story dependencies
-        target_length: Target number of story steps
-        branching_factor: Average number of choices per step
-        
-    Returns:
-        List of generated story steps
+    The agent holds no per-run state (dependencies are passed to each run),
+    so a single instance is reused across generate_storyline calls.
     """
-    author = ctx.deps.author
-    story = ctx.deps.story
-    
-    # Create story outline based on author style and story requirements
-    steps = []
-    
-    for step_num in range(1, target_length + 1):
-        # Generate narrative for this step
-        narrative = await _generate_step_narrative(
-            step_num, author, story, target_length
-        )
-        
-        # Generate choices for this step
-        choices = await _generate_step_choices(
-            step_num, author, story, target_length, branching_factor
-        )
-        
-        step = StoryStep(
-            step_id=str(step_num),
-            narrative=narrative,
-            choices=choices
-        )
-        steps.append(step)
-    
-    return steps
+    return create_storyline_agent()
 
 
-async def generate_game_endings(
-    ctx: RunContext[StorylineDependencies],
-    story_steps: List[StoryStep]
-) -> Dict[EndingType, str]:
-    """
-    Generate appropriate endings for the adventure.
-    
-    Args:
-        ctx: Agent context with author and story dependencies
-        story_steps: Generated story steps for context
-        
-    Returns:
-        Dict mapping ending types to ending text
-    """
-    author = ctx.deps.author
-    story = ctx.deps.story
-    
-    endings = {}
-    
-    # Generate success ending
-    success_ending = await _generate_ending(
-        EndingType.SUCCESS, author, story, story_steps
-    )
-    endings[EndingType.SUCCESS] = success_ending
-    
-    # Generate failure ending
-    failure_ending = await _generate_ending(
-        EndingType.FAILURE, author, story, story_steps
+def create_endings_agent() -> Agent[StorylineDependencies, Dict[EndingType, str]]:
+    """Create an agent that writes all requested endings in a single run."""
+    return Agent[StorylineDependencies, Dict[EndingType, str]](
+        'gemini-1.5-flash',
+        deps_type=StorylineDependencies,
+        output_type=Dict[EndingType, str],
+        system_prompt=(
+            "You are an expert adventure story writer. Write the requested endings "
+            "for an adventure in the author's style, returned as a mapping from "
+            "ending type to ending text."
+        ),
     )
-    endings[EndingType.FAILURE] = failure_ending
-    
-    # Generate neutral ending if requested
-    if story.technical_requirements.get("endings", 2) >= 3:
-        neutral_ending = await _generate_ending(
-            EndingType.NEUTRAL, author, story, story_steps
-        )
-        endings[EndingType.NEUTRAL] = neutral_ending
-    
-    return endings
+
+
+@functools.lru_cache(maxsize=1)
+def _endings_agent() -> Agent[StorylineDependencies, Dict[EndingType, str]]:
+    """Return the shared endings agent, creating it on first use."""
+    return create_endings_agent()
 
 
 async def generate_storyline(
     author: AuthorPersona, 
-    story: StoryRequirements
+    story: StoryRequirements,
+    step_range: Tuple[int, int] | None = None,
+    limiter: RequestRateLimiter | None = None,
+    on_partial: Callable[[AdventureGame], None] | None = None
 ) -> ToolResult:
     """
     Main storyline generation function.
@@ -139,32 +149,79 @@ async def generate_storyline(
     Args:
         author: Author persona defining writing style
         story: Story requirements and constraints
+        step_range: Optional inclusive (first, last) step numbers to generate
+            when producing one chunk of a larger adventure
+        limiter: Optional rate limiter shared by the requests of one run
+        on_partial: Optional callback; when given, the model output is
+            streamed and each partial adventure snapshot is passed to it.
+            A request that joins an identical run already in flight only
+            receives the final result.
         
     Returns:
         ToolResult containing generated AdventureGame or error information
     """
+    key = _request_key(author, story, step_range)
+    
+    # Identical request already running: wait for it and take a private copy
+    while (pending := _inflight.get(key)) is not None:
+        try:
+            shared = await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            # The run was cancelled by its owner, not by us: start it again
+            if pending.cancelled() and not asyncio.current_task().cancelling():
+                continue
+            raise
+        return shared.model_copy(deep=True)
+    
+    future: asyncio.Future[ToolResult] = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        result = await _generate_storyline(author, story, step_range, limiter, on_partial)
+        future.set_result(result)
+        return result
+    finally:
+        del _inflight[key]
+        if not future.done():
+            future.cancel()
+
+
+def _request_key(
+    author: AuthorPersona,
+    story: StoryRequirements,
+    step_range: Tuple[int, int] | None
+) -> str:
+    """Build a stable key identifying a storyline generation request."""
+    digest = hashlib.sha256()
+    digest.update(author.model_dump_json().encode())
+    digest.update(story.model_dump_json().encode())
+    digest.update(repr(step_range).encode())
+    return digest.hexdigest()
+
+
+async def _generate_storyline(
+    author: AuthorPersona,
+    story: StoryRequirements,
+    step_range: Tuple[int, int] | None,
+    limiter: RequestRateLimiter | None,
+    on_partial: Callable[[AdventureGame], None] | None
+) -> ToolResult:
+    """Run storyline generation for a single, deduplicated request."""
     try:
         # Set up dependencies
-        deps = StorylineDependencies(author, story)
+        deps = StorylineDependencies(author, story, limiter)
         
         # Get target length from story requirements
-        target_length = story.technical_requirements.get("length", 10)
-        if isinstance(target_length, str):
-            # Extract number from string like "8-12 story steps"
-            import re
-            match = re.search(r'(\d+)', str(target_length))
-            target_length = int(match.group(1)) if match else 10
+        target_length = _target_length(story)
         
         # Generate the adventure using the agent
-        agent = create_storyline_agent()
-        result = await agent.run(
-            f"Create a {target_length}-step adventure based on the provided "
-            f"author style and story requirements. The story should be about: {story.plot}",
-            deps=deps
+        agent = _storyline_agent()
+        adventure = await _run_with_retry(
+            agent,
+            _build_storyline_prompt(author, story, target_length, step_range=step_range),
+            deps,
+            on_partial
         )
         
-        adventure = result.output
-        
         # Add metadata
         adventure.game_name = f"{author.themes[0]} Adventure" if author.themes else "Generated Adventure"
         
@@ -187,148 +244,161 @@ async def generate_storyline(
         )
 
 
-async def _generate_step_narrative(
-    step_num: int, 
-    author: AuthorPersona, 
-    story: StoryRequirements, 
-    total_steps: int
-) -> str:
-    """Generate narrative text for a specific step."""
-    
-    # Determine story progression
-    if step_num == 1:
-        phase = "opening"
-    elif step_num <= total_steps // 3:
-        phase = "setup"
-    elif step_num <= (total_steps * 2) // 3:
-        phase = "development"
-    else:
-        phase = "climax"
-    
-    # Create narrative based on author style and story context
-    style_elements = ", ".join(author.voice_and_tone[:2])
-    narrative_style = ", ".join(author.narrative_style[:2])
-    
-    # Create a contextual narrative
-    setting = story.setting.get("location", "unknown location")
-    character_background = story.main_character.get("background", "adventurer")
+def _target_length(story: StoryRequirements) -> int:
+    """Get the target step count from the story's technical requirements."""
+    target_length = story.technical_requirements.get("length", 10)
+    if isinstance(target_length, str):
+        # Extract number from string like "8-12 story steps"
+        match = re.search(r'(\d+)', target_length)
+        return int(match.group(1)) if match else 10
+    if isinstance(target_length, int):
+        return target_length
+    return 10
+
+
+async def generate_endings(
+    author: AuthorPersona,
+    story: StoryRequirements,
+    story_steps: List[StoryStep],
+    limiter: RequestRateLimiter | None = None
+) -> Dict[EndingType, str]:
+    """
+    Generate every requested ending with one structured agent run.
     
-    if phase == "opening":
-        narrative = (
-            f"You find yourself in {setting}, {character_background} seeking adventure. "
-            f"The {phase} of your journey unfolds with {style_elements}. "
-            f"The world around you reflects {narrative_style} as you begin to understand "
-            f"the challenge ahead. {story.plot[:100]}..."
-        )
-    else:
-        narrative = (
-            f"As your adventure continues in {setting}, the {phase} brings new challenges. "
-            f"Your character as {character_background} faces decisions that will shape "
-            f"the outcome of {story.plot[:50]}... The atmosphere maintains {style_elements} "
-            f"while the narrative unfolds with {narrative_style}."
-        )
+    Args:
+        author: Author persona defining writing style
+        story: Story requirements and constraints
+        story_steps: Generated story steps for context
+        limiter: Optional rate limiter shared by the requests of one run
+        
+    Returns:
+        Dict mapping ending types to ending text
+    """
+    deps = StorylineDependencies(author, story, limiter)
+    ending_types = _requested_endings(story)
     
-    # Ensure minimum length
-    while len(narrative) < 50:
-        narrative += f" The {phase} deepens as you proceed."
+    output = await _run_with_retry(
+        _endings_agent(),
+        f"Write these endings: {', '.join(ending.value for ending in ending_types)}.\n\n"
+        f"The adventure has {len(story_steps)} steps and is about: {story.plot}\n"
+        f"Setting: {deps.setting_location or 'this world'}\n"
+        f"Style: {author.style_prefix}\n"
+        f"Theme: {author.primary_theme}",
+        deps
+    )
     
-    return narrative
+    return {ending: text for ending, text in output.items() if ending in ending_types}
 
 
-async def _generate_step_choices(
-    step_num: int,
-    author: AuthorPersona,
-    story: StoryRequirements, 
-    total_steps: int,
-    branching_factor: int
-) -> List[Choice]:
-    """Generate choices for a specific step."""
-    
-    choices = []
-    choice_labels = [ChoiceLabel.A, ChoiceLabel.B, ChoiceLabel.C, ChoiceLabel.D]
+def _requested_endings(story: StoryRequirements) -> List[EndingType]:
+    """Get the ending types the story asks for."""
+    ending_types = [EndingType.SUCCESS, EndingType.FAILURE]
+    ending_count = story.technical_requirements.get("endings", 2)
+    if isinstance(ending_count, int) and ending_count >= 3:
+        ending_types.append(EndingType.NEUTRAL)
+    return ending_types
+
+
+async def _run_with_retry(
+    agent: Agent[StorylineDependencies, OutputT],
+    prompt: str,
+    deps: StorylineDependencies,
+    on_partial: Callable[[OutputT], None] | None = None
+) -> OutputT:
+    """
+    Run the agent, retrying transient provider errors with jittered backoff.
     
-    num_choices = min(branching_factor, len(choice_labels))
+    A retried streaming run starts its stream again from the beginning.
+    """
+    # One rate-limit slot per logical request; retries are paced by the backoff
+    if deps.limiter is not None:
+        await deps.limiter.acquire()
     
-    for i in range(num_choices):
-        label = choice_labels[i]
+    for attempt in range(MAX_RUN_ATTEMPTS - 1):
+        try:
+            return await _run_agent(agent, prompt, deps, on_partial)
+        except ModelHTTPError as e:
+            if not (e.status_code == 429 or e.status_code >= 500):
+                raise
         
-        # Determine target based on step progression
-        if step_num >= total_steps - 1:
-            # Last steps should lead to endings
-            if i == 0:
-                target = "ENDING_SUCCESS"
-            elif i == 1:
-                target = "ENDING_FAILURE" 
-            else:
-                target = "ENDING_NEUTRAL"
-        else:
-            # Regular steps lead to next steps
-            target = f"STEP_{step_num + 1}"
-        
-        # Generate choice description based on author style
-        if "witty" in author.voice_and_tone[0].lower():
-            descriptions = [
-                "Take the clever approach with wit and charm",
-                "Use humor to defuse the situation", 
-                "Apply unconventional wisdom",
-                "Trust in the absurd logic of the universe"
-            ]
-        else:
-            descriptions = [
-                "Take the direct approach",
-                "Seek more information first",
-                "Try a diplomatic solution",
-                "Trust your instincts"
-            ]
-        
-        description = descriptions[i] if i < len(descriptions) else f"Choose path {label.value}"
-        
-        choice = Choice(
-            label=label,
-            description=description,
-            target=target,
-            conditions=[],
-            consequences=[]
-        )
-        choices.append(choice)
+        # Full jitter: sleep a random fraction of the exponential delay
+        delay = min(RETRY_BASE_DELAY * 2 ** attempt, RETRY_MAX_DELAY)
+        await asyncio.sleep(random.uniform(0, delay))
+    
+    # Whatever the final attempt raises goes to the caller
+    return await _run_agent(agent, prompt, deps, on_partial)
+
+
+async def _run_agent(
+    agent: Agent[StorylineDependencies, OutputT],
+    prompt: str,
+    deps: StorylineDependencies,
+    on_partial: Callable[[OutputT], None] | None
+) -> OutputT:
+    """Run the agent once, streaming partial output to on_partial if given."""
+    if on_partial is None:
+        return (await agent.run(prompt, deps=deps)).output
     
-    return choices
+    async with agent.run_stream(prompt, deps=deps) as result:
+        async for partial in result.stream():
+            on_partial(partial)
+        return await result.get_output()
 
 
-async def _generate_ending(
-    ending_type: EndingType,
+def _build_storyline_prompt(
     author: AuthorPersona,
     story: StoryRequirements,
-    story_steps: List[StoryStep]
+    target_length: int,
+    branching_factor: int = 2,
+    step_range: Tuple[int, int] | None = None
 ) -> str:
-    """Generate an ending of the specified type."""
+    """
+    Build the prompt for generating an adventure, or one chunk of it.
     
-    style = ", ".join(author.voice_and_tone[:2])
-    theme = author.themes[0] if author.themes else "adventure"
+    The author and story context comes first and is identical for every
+    chunk of the same adventure, so providers that cache shared prompt
+    prefixes only process the chunk-specific instructions at the end.
+    """
+    endings = ", ".join(ending.value for ending in _requested_endings(story))
     
-    if ending_type == EndingType.SUCCESS:
-        ending = (
-            f"Congratulations! Your journey through {story.setting.get('location', 'this world')} "
-            f"has reached a triumphant conclusion. With {style}, you have successfully "
-            f"resolved the challenge of {story.plot[:50]}... The theme of {theme} "
-            f"resonates as you emerge victorious, having grown as {story.main_character.get('background', 'an adventurer')}."
-        )
-    elif ending_type == EndingType.FAILURE:
-        ending = (
-            f"Despite your best efforts, your adventure in {story.setting.get('location', 'this world')} "
-            f"has not gone as planned. With characteristic {style}, you face the consequences "
-            f"of the choices made during {story.plot[:50]}... Yet there is wisdom in this failure, "
-            f"and the theme of {theme} teaches valuable lessons about perseverance."
-        )
-    else:  # NEUTRAL
-        ending = (
-            f"Your journey through {story.setting.get('location', 'this world')} concludes "
-            f"with mixed results. The {style} of your adventure regarding {story.plot[:50]}... "
-            f"has led to a complex resolution. The theme of {theme} suggests that not all "
-            f"adventures end in clear victory or defeat, but in nuanced understanding."
+    if step_range is None:
+        first_step, last_step = 1, target_length
+        task = f"Create a {target_length}-step adventure based on the context above."
+    else:
+        first_step, last_step = step_range
+        task = (
+            f"Create steps {first_step} to {last_step} of a {target_length}-step "
+            f"adventure based on the context above."
         )
     
-    return ending
+    return (
+        f"{_build_context_prefix(author, story)}\n\n"
+        f"{task}\n\n"
+        f"Structure:\n"
+        f"- Exactly {last_step - first_step + 1} steps with step IDs '{first_step}' to '{last_step}'\n"
+        f"- About {branching_factor} choices per step, labelled A-D\n"
+        f"- Choice targets are STEP_<n> or ENDING_SUCCESS/ENDING_FAILURE/ENDING_NEUTRAL\n"
+        f"- Endings to include: {endings}"
+    )
+
+
+def _build_context_prefix(author: AuthorPersona, story: StoryRequirements) -> str:
+    """
+    Build the shared author/story context that leads every storyline prompt.
+    
+    Structured fields are serialized with pydantic-core's JSON encoder, the
+    same Rust serializer pydantic_ai uses for model payloads.
+    """
+    return (
+        f"Author style:\n"
+        f"- Voice/Tone: {', '.join(author.voice_and_tone)}\n"
+        f"- Narrative Style: {', '.join(author.narrative_style)}\n"
+        f"- Themes: {', '.join(author.themes)}\n\n"
+        f"Story requirements:\n"
+        f"- Setting: {to_json(story.setting).decode()}\n"
+        f"- Main Character: {to_json(story.main_character).decode()}\n"
+        f"- Plot: {story.plot}"
+    )
 
 
 async def chunk_storyline_generation(
@@ -348,31 +418,46 @@ async def chunk_storyline_generation(
         ToolResult with complete adventure
     """
     try:
-        target_length = story.technical_requirements.get("length", 10)
-        if isinstance(target_length, str):
-            import re
-            match = re.search(r'(\d+)', str(target_length))
-            target_length = int(match.group(1)) if match else 10
+        target_length = _target_length(story)
         
         # Generate in chunks if large
         if target_length > chunk_size * 2:
-            all_steps = []
-            for chunk_start in range(1, target_length + 1, chunk_size):
+            # The run's requests share one budget, created here so it is
+            # bound to this run's event loop
+            limiter = RequestRateLimiter(MAX_REQUESTS_PER_MINUTE)
+            
+            # Queue every chunk and drain it with a bounded pool of workers;
+            # the first failure cancels the rest
+            queue: asyncio.Queue[Tuple[int, Tuple[int, int]]] = asyncio.Queue()
+            for index, chunk_start in enumerate(range(1, target_length + 1, chunk_size)):
                 chunk_end = min(chunk_start + chunk_size - 1, target_length)
-                
-                # Generate chunk
-                chunk_result = await generate_storyline(author, story)
-                if not chunk_result.success:
-                    return chunk_result
-                
-                chunk_adventure = chunk_result.data
-                all_steps.extend(list(chunk_adventure.steps.values()))
+                queue.put_nowait((index, (chunk_start, chunk_end)))
+            
+            results: List[ToolResult | None] = [None] * queue.qsize()
+            failed: ToolResult | None = None
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    for _ in range(min(MAX_CONCURRENT_CHUNKS, queue.qsize())):
+                        tg.create_task(_chunk_worker(author, story, queue, results, limiter))
+            except* ChunkGenerationError as group:
+                failed = group.exceptions[0].result
+            
+            if failed is not None:
+                return failed
+            
+            all_steps = []
+            for chunk_result in results:
+                all_steps.extend(chunk_result.data.steps.values())
+            
+            # Endings are written once for the combined adventure
+            steps = all_steps[:target_length]
+            endings = await generate_endings(author, story, steps, limiter)
             
             # Combine chunks into complete adventure
             final_adventure = AdventureGame(
                 game_name=f"{author.themes[0]} Adventure" if author.themes else "Generated Adventure",
-                steps={str(i+1): step for i, step in enumerate(all_steps[:target_length])},
-                endings={}  # Will be generated separately
+                steps=dict(zip(_step_ids(len(steps)), steps)),
+                endings=endings
             )
             
             return ToolResult(
@@ -390,4 +475,39 @@ async def chunk_storyline_generation(
             success=False,
             message=f"Chunked storyline generation failed: {str(e)}",
             metadata={"error_type": type(e).__name__}
-        )
\ No newline at end of file
+        )
+
+
+def _step_ids(count: int) -> Tuple[str, ...]:
+    """Get the step IDs '1'..count, reusing the precomputed keys when possible."""
+    if count <= len(_STEP_IDS):
+        return _STEP_IDS[:count]
+    return _STEP_IDS + tuple(str(i) for i in range(len(_STEP_IDS) + 1, count + 1))
+
+
+async def _chunk_worker(
+    author: AuthorPersona,
+    story: StoryRequirements,
+    queue: asyncio.Queue[Tuple[int, Tuple[int, int]]],
+    results: List[ToolResult | None],
+    limiter: RequestRateLimiter
+) -> None:
+    """Generate queued chunks until the queue is empty."""
+    while not queue.empty():
+        index, step_range = queue.get_nowait()
+        results[index] = await _generate_chunk(author, story, step_range, limiter)
+
+
+async def _generate_chunk(
+    author: AuthorPersona,
+    story: StoryRequirements,
+    step_range: Tuple[int, int],
+    limiter: RequestRateLimiter
+) -> ToolResult:
+    """Generate one chunk, raising ChunkGenerationError on failure."""
+    result = await generate_storyline(author, story, step_range, limiter)
+    
+    if not result.success:
+        raise ChunkGenerationError(result)
+    
+    return result
@@ -10,7 +10,8 @@ from adventure_agent.agent import (
     generate_adventure,
     generate_adventure_from_files,
     _calculate_overall_quality,
-    _generate_pipeline_summary
+    _generate_pipeline_summary,
+    _stream_storyline_with_progress
 )
 from adventure_agent.models import AuthorPersona, StoryRequirements, ToolResult
 
@@ -384,6 +385,22 @@ Endings: 2 (success, failure)
         assert deps.tool_results == {}
         assert deps.streaming_enabled is True
         assert deps.quality_threshold == 7.0
+    
+    @pytest.mark.asyncio
+    async def test_stream_storyline_reports_step_counts(self, sample_author, sample_story):
+        """Test that streamed snapshots are reported as drafted step counts."""
+        
+        async def fake_generate_storyline(author, story, on_partial=None):
+            for step_count in (1, 2):
+                on_partial(type("Partial", (), {"steps": dict.fromkeys(range(step_count))})())
+            return ToolResult(success=True, message="Storyline generated")
+        
+        drafted = []
+        with patch('adventure_agent.agent.generate_storyline', side_effect=fake_generate_storyline):
+            result = await _stream_storyline_with_progress(sample_author, sample_story, drafted.append)
+        
+        assert result.success
+        assert drafted == [1, 2]
 
 
 class TestAdventureAgent:
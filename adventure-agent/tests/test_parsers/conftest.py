@@ -0,0 +1,76 @@
+"""
+Shared fixtures for the parser tests.
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def complete_author_content():
+    """Return a .author file that fills every section."""
+    return """
+# Voice and Tone
+- Witty and satirical
+- Humorous undertones
+- Ironic observations
+
+# Narrative Style
+- Descriptive prose
+- Character-driven storytelling
+- Third-person omniscient
+
+# World Elements
+- Fantasy setting with modern sensibilities
+- Magical bureaucracy
+- Anthropomorphic Death
+
+# Character Development
+- Growth through adversity
+- Humor in the face of tragedy
+- Reluctant heroes
+
+# Themes
+- Good vs evil (but it's complicated)
+- The power of friendship
+- Bureaucracy and society
+"""
+
+
+@pytest.fixture(scope="session")
+def complete_story_content():
+    """Return a .story file that fills every section."""
+    return """
+# Setting
+Location: Ankh-Morpork
+Time Period: Fantasy/Medieval
+Atmosphere: Bustling city
+
+# Main Character
+Name: Rincewind
+Background: Incompetent wizard
+Motivation: Survival and avoiding responsibility
+Personality: Cowardly but resourceful
+
+# Plot
+Rincewind must deliver an important message from the Unseen University to the Patrician's Palace, but various magical and mundane obstacles keep getting in his way. The message contains vital information about a brewing magical crisis.
+
+# NPCs
+- The Librarian: The orangutan librarian of Unseen University who provides cryptic assistance
+- Lord Vetinari: The Patrician of Ankh-Morpork, expecting the message
+- Luggage: Rincewind's magical travel chest with hundreds of little legs
+- Death: May appear if things go very wrong
+
+# Branches
+- Diplomatic Approach: Try to use official channels and proper procedures
+- Sneaky Route: Attempt to avoid attention and sneak through back alleys
+- Magical Solution: Use unreliable magic to solve problems
+- Direct Confrontation: Face obstacles head-on despite being terrible at fighting
+
+# Technical Requirements
+Length: 8-12 story steps
+Branches: 3 major branching points
+Endings: 3 (success, failure, neutral)
+Complexity: Medium
+Target Audience: Fantasy fans
+Estimated Playtime: 15-20 minutes
+"""
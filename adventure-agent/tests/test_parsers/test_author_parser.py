@@ -2,67 +2,14 @@
 Tests for the author file parser.
 """
 
+from collections import Counter
+
 import pytest
-from adventure_agent.parsers.author_parser import parse_author_file
+from adventure_agent.parsers.author_parser import parse_author_content, parse_author_file
 from adventure_agent.models import AuthorPersona
 
 
-class TestAuthorParser:
-    """Test the author file parsing functionality."""
-    
-    def test_parse_complete_author_file(self):
-        """Test parsing a complete author file."""
-        content = """
-# Voice and Tone
-- Witty and satirical
-- Humorous undertones
-- Ironic observations
-
-# Narrative Style
-- Descriptive prose
-- Character-driven storytelling
-- Third-person omniscient
-
-# World Elements
-- Fantasy setting with modern sensibilities
-- Magical bureaucracy
-- Anthropomorphic Death
-
-# Character Development
-- Growth through adversity
-- Humor in the face of tragedy
-- Reluctant heroes
-
-# Themes
-- Good vs evil (but it's complicated)
-- The power of friendship
-- Bureaucracy and society
-"""
-        
-        author = parse_author_file(content)
-        
-        assert isinstance(author, AuthorPersona)
-        assert len(author.voice_and_tone) == 3
-        assert "Witty and satirical" in author.voice_and_tone
-        assert "Humorous undertones" in author.voice_and_tone
-        assert "Ironic observations" in author.voice_and_tone
-        
-        assert len(author.narrative_style) == 3
-        assert "Descriptive prose" in author.narrative_style
-        assert "Character-driven storytelling" in author.narrative_style
-        
-        assert len(author.world_elements) == 3
-        assert "Fantasy setting with modern sensibilities" in author.world_elements
-        
-        assert len(author.character_development) == 3
-        assert "Growth through adversity" in author.character_development
-        
-        assert len(author.themes) == 3
-        assert "Good vs evil (but it's complicated)" in author.themes
-    
-    def test_parse_minimal_author_file(self):
-        """Test parsing a minimal author file."""
-        content = """
+_MINIMAL_AUTHOR = """
 # Voice and Tone
 - Simple tone
 
@@ -78,19 +25,8 @@ class TestAuthorParser:
 # Themes
 - Basic theme
 """
-        
-        author = parse_author_file(content)
-        
-        assert isinstance(author, AuthorPersona)
-        assert len(author.voice_and_tone) == 1
-        assert len(author.narrative_style) == 1
-        assert len(author.world_elements) == 1
-        assert len(author.character_development) == 1
-        assert len(author.themes) == 1
-    
-    def test_parse_author_file_with_extra_whitespace(self):
-        """Test parsing author file with extra whitespace."""
-        content = """
+
+_EXTRA_WHITESPACE_AUTHOR = """
 
 # Voice and Tone
 
@@ -113,17 +49,8 @@ class TestAuthorParser:
 - Good vs evil
 
 """
-        
-        author = parse_author_file(content)
-        
-        assert isinstance(author, AuthorPersona)
-        assert len(author.voice_and_tone) == 2
-        assert "Witty and satirical" in author.voice_and_tone
-        assert "Humorous undertones" in author.voice_and_tone
-    
-    def test_parse_author_file_mixed_case_headers(self):
-        """Test parsing author file with mixed case headers."""
-        content = """
+
+_MIXED_CASE_HEADERS_AUTHOR = """
 # voice and tone
 - Witty style
 
@@ -139,19 +66,8 @@ class TestAuthorParser:
 # themes
 - Adventure
 """
-        
-        author = parse_author_file(content)
-        
-        assert isinstance(author, AuthorPersona)
-        assert len(author.voice_and_tone) == 1
-        assert len(author.narrative_style) == 1
-        assert len(author.world_elements) == 1
-        assert len(author.character_development) == 1
-        assert len(author.themes) == 1
-    
-    def test_parse_author_file_with_numbered_lists(self):
-        """Test parsing author file with numbered lists instead of bullets."""
-        content = """
+
+_NUMBERED_LISTS_AUTHOR = """
 # Voice and Tone
 1. Witty and satirical
 2. Humorous undertones
@@ -168,36 +84,16 @@ class TestAuthorParser:
 # Themes
 1. Good vs evil
 """
-        
-        author = parse_author_file(content)
-        
-        assert isinstance(author, AuthorPersona)
-        assert len(author.voice_and_tone) == 2
-        assert "Witty and satirical" in author.voice_and_tone
-        assert "Humorous undertones" in author.voice_and_tone
-    
-    def test_parse_author_file_missing_sections(self):
-        """Test parsing author file with missing sections."""
-        content = """
+
+_MISSING_SECTIONS_AUTHOR = """
 # Voice and Tone
 - Witty style
 
 # Themes
 - Adventure theme
 """
-        
-        author = parse_author_file(content)
-        
-        assert isinstance(author, AuthorPersona)
-        assert len(author.voice_and_tone) == 1
-        assert len(author.narrative_style) == 0  # Missing section
-        assert len(author.world_elements) == 0   # Missing section
-        assert len(author.character_development) == 0  # Missing section
-        assert len(author.themes) == 1
-    
-    def test_parse_author_file_empty_sections(self):
-        """Test parsing author file with empty sections."""
-        content = """
+
+_EMPTY_SECTIONS_AUTHOR = """
 # Voice and Tone
 - Witty style
 
@@ -211,19 +107,8 @@ class TestAuthorParser:
 # Themes
 - Adventure
 """
-        
-        author = parse_author_file(content)
-        
-        assert isinstance(author, AuthorPersona)
-        assert len(author.voice_and_tone) == 1
-        assert len(author.narrative_style) == 0  # Empty section
-        assert len(author.world_elements) == 1
-        assert len(author.character_development) == 0  # Empty section
-        assert len(author.themes) == 1
-    
-    def test_parse_author_file_special_characters(self):
-        """Test parsing author file with special characters."""
-        content = """
+
+_SPECIAL_CHARACTERS_AUTHOR = """
 # Voice and Tone
 - "Witty" & satirical (with quotes)
 - Humorous—with dashes
@@ -243,18 +128,8 @@ class TestAuthorParser:
 # Themes
 - Good vs. evil: it's complicated!
 """
-        
-        author = parse_author_file(content)
-        
-        assert isinstance(author, AuthorPersona)
-        assert len(author.voice_and_tone) == 3
-        assert ""Witty" & satirical (with quotes)" in author.voice_and_tone
-        assert "Humorous—with dashes" in author.voice_and_tone
-        assert "Café-style narrative" in author.voice_and_tone
-    
-    def test_parse_author_file_long_entries(self):
-        """Test parsing author file with very long entries."""
-        content = """
+
+_LONG_ENTRIES_AUTHOR = """
 # Voice and Tone
 - This is a very long voice and tone description that spans multiple concepts and ideas, including wit, satire, humor, irony, and various other literary devices that make the writing engaging and memorable for readers
 - Short entry
@@ -271,49 +146,16 @@ class TestAuthorParser:
 # Themes
 - Complex themes
 """
-        
-        author = parse_author_file(content)
-        
-        assert isinstance(author, AuthorPersona)
-        assert len(author.voice_and_tone) == 2
-        assert len(author.voice_and_tone[0]) > 100  # Long entry
-        assert len(author.voice_and_tone[1]) < 20   # Short entry
-    
-    def test_parse_empty_author_file(self):
-        """Test parsing an empty author file."""
-        content = ""
-        
-        author = parse_author_file(content)
-        
-        assert isinstance(author, AuthorPersona)
-        assert len(author.voice_and_tone) == 0
-        assert len(author.narrative_style) == 0
-        assert len(author.world_elements) == 0
-        assert len(author.character_development) == 0
-        assert len(author.themes) == 0
-    
-    def test_parse_author_file_only_headers(self):
-        """Test parsing author file with only headers and no content."""
-        content = """
+
+_ONLY_HEADERS_AUTHOR = """
 # Voice and Tone
 # Narrative Style
 # World Elements
 # Character Development
 # Themes
 """
-        
-        author = parse_author_file(content)
-        
-        assert isinstance(author, AuthorPersona)
-        assert len(author.voice_and_tone) == 0
-        assert len(author.narrative_style) == 0
-        assert len(author.world_elements) == 0
-        assert len(author.character_development) == 0
-        assert len(author.themes) == 0
-    
-    def test_parse_author_file_duplicate_entries(self):
-        """Test parsing author file with duplicate entries."""
-        content = """
+
+_DUPLICATE_ENTRIES_AUTHOR = """
 # Voice and Tone
 - Witty style
 - Witty style
@@ -332,10 +174,187 @@ class TestAuthorParser:
 # Themes
 - Adventure
 """
+
+
+_SECTIONS = (
+    "voice_and_tone",
+    "narrative_style",
+    "world_elements",
+    "character_development",
+    "themes",
+)
+
+
+def _check_author(author, **lengths):
+    """Assert the parsed model type and the length of each named section."""
+    assert isinstance(author, AuthorPersona)
+    for section, length in lengths.items():
+        assert len(getattr(author, section)) == length, section
+
+
+def _assert_counts(items, expected):
+    """Assert how often each entry appears, counting the list only once."""
+    counts = Counter(items)
+    for entry, count in expected.items():
+        assert counts[entry] == count
+
+
+class TestAuthorParser:
+    """Test the author file parsing functionality."""
+    
+    def test_parse_complete_author_file(self, complete_author_content):
+        """Test parsing a complete author file."""
+        author = parse_author_content(complete_author_content)
         
-        author = parse_author_file(content)
+        _check_author(author, **dict.fromkeys(_SECTIONS, 3))
+        assert "Witty and satirical" in author.voice_and_tone
+        assert "Humorous undertones" in author.voice_and_tone
+        assert "Ironic observations" in author.voice_and_tone
+        assert "Descriptive prose" in author.narrative_style
+        assert "Character-driven storytelling" in author.narrative_style
+        assert "Fantasy setting with modern sensibilities" in author.world_elements
+        assert "Growth through adversity" in author.character_development
+        assert "Good vs evil (but it's complicated)" in author.themes
+    
+    @pytest.mark.parametrize(
+        "content,expected_lengths,expected_items",
+        [
+            (_MINIMAL_AUTHOR, (1, 1, 1, 1, 1), {}),
+            (
+                _EXTRA_WHITESPACE_AUTHOR,
+                (2, 1, 1, 1, 1),
+                {"voice_and_tone": ["Witty and satirical", "Humorous undertones"]},
+            ),
+            (_MIXED_CASE_HEADERS_AUTHOR, (1, 1, 1, 1, 1), {}),
+            (
+                _NUMBERED_LISTS_AUTHOR,
+                (2, 1, 1, 1, 1),
+                {"voice_and_tone": ["Witty and satirical", "Humorous undertones"]},
+            ),
+            (
+                _SPECIAL_CHARACTERS_AUTHOR,
+                (3, 2, 2, 1, 1),
+                {
+                    "voice_and_tone": [
+                        '"Witty" & satirical (with quotes)',
+                        "Humorous—with dashes",
+                        "Café-style narrative",
+                    ],
+                },
+            ),
+        ],
+        ids=[
+            "minimal",
+            "extra_whitespace",
+            "mixed_case_headers",
+            "numbered_lists",
+            "special_characters",
+        ],
+    )
+    def test_parse_author_file(self, content, expected_lengths, expected_items):
+        """Test the section sizes and entries parsed from an author file."""
+        author = parse_author_content(content)
+        
+        _check_author(author, **dict(zip(_SECTIONS, expected_lengths)))
+        
+        for field, items in expected_items.items():
+            for item in items:
+                assert item in getattr(author, field)
+    
+    @pytest.mark.parametrize(
+        "content,section",
+        [
+            (_MISSING_SECTIONS_AUTHOR, "Narrative Style"),
+            (_EMPTY_SECTIONS_AUTHOR, "Narrative Style"),
+            ("", "Voice and Tone"),
+            (_ONLY_HEADERS_AUTHOR, "Voice and Tone"),
+        ],
+        ids=["missing_sections", "empty_sections", "empty_file", "only_headers"],
+    )
+    def test_parse_author_file_missing_required_section(self, content, section):
+        """Test that a missing or empty required section is rejected."""
+        with pytest.raises(ValueError, match=f"'{section}' section"):
+            parse_author_content(content)
+    
+    def test_parse_author_file_long_entries(self):
+        """Test parsing author file with very long entries."""
+        author = parse_author_content(_LONG_ENTRIES_AUTHOR)
+        
+        _check_author(author, voice_and_tone=2)
+        assert len(author.voice_and_tone[0]) > 100  # Long entry
+        assert len(author.voice_and_tone[1]) < 20   # Short entry
+    
+    def test_parse_author_file_duplicate_entries(self):
+        """Test parsing author file with duplicate entries."""
+        author = parse_author_content(_DUPLICATE_ENTRIES_AUTHOR)
         
-        assert isinstance(author, AuthorPersona)
         # Should contain duplicates as the parser doesn't deduplicate
-        assert len(author.voice_and_tone) == 4
-        assert author.voice_and_tone.count("Witty style") == 3
\ No newline at end of file
+        _check_author(author, voice_and_tone=4)
+        _assert_counts(
+            author.voice_and_tone,
+            {"Witty style": 3, "Different style": 1},
+        )
+    
+    def test_parse_author_file_normalizes_unicode(self):
+        """Test that decomposed accents and control characters are normalized."""
+        content = _SPECIAL_CHARACTERS_AUTHOR.replace(
+            "Café-style", "Cafe\u0301-style\x00"
+        )
+        
+        author = parse_author_content(content)
+        
+        assert "Café-style narrative" in author.voice_and_tone
+    
+    def test_parse_author_content_section_precedence(self):
+        """Test that a repeated header replaces the earlier one and aliases keep their priority."""
+        content = _MINIMAL_AUTHOR + """
+# Voice and Tone
+- Replacement tone
+
+# World Elements
+- Generic world
+
+# Discworld Elements to Include
+- Discworld world
+"""
+        
+        author = parse_author_content(content)
+        
+        assert author.voice_and_tone == ["Replacement tone"]
+        assert author.world_elements == ["Discworld world"]
+    
+    def test_parse_author_content_returns_independent_models(self, complete_author_content):
+        """Test that mutating a parsed persona does not leak into the next parse."""
+        author = parse_author_content(complete_author_content)
+        author.themes.append("Added theme")
+        author.voice_and_tone.clear()
+        
+        reparsed = parse_author_content(complete_author_content)
+        
+        assert reparsed is not author
+        assert "Added theme" not in reparsed.themes
+        assert "Witty and satirical" in reparsed.voice_and_tone
+    
+    def test_parse_author_content_indented_headers(self):
+        """Test that indented level 1 and 2 headers start sections and deeper ones do not."""
+        content = """
+  # Voice and Tone
+  - Indented tone
+    ### Not a section
+  - Second tone
+
+   ## Narrative Style
+- Indented style
+
+# Character Development
+- Standard growth
+
+\t# Themes
+- Tabbed theme
+"""
+        
+        author = parse_author_content(content)
+        
+        assert author.voice_and_tone == ["Indented tone", "Second tone"]
+        assert author.narrative_style == ["Indented style"]
+        assert author.themes == ["Tabbed theme"]
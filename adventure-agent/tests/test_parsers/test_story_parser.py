@@ -2,53 +2,156 @@
 Tests for the story file parser.
 """
 
+from pathlib import Path
+
 import pytest
-from adventure_agent.parsers.story_parser import parse_story_file
+from adventure_agent.parsers.story_parser import parse_story_content, parse_story_file
 from adventure_agent.models import StoryRequirements
 
+_EXAMPLES_DIR = Path(__file__).parents[2] / "examples"
 
-class TestStoryParser:
-    """Test the story file parsing functionality."""
-    
-    def test_parse_complete_story_file(self):
-        """Test parsing a complete story file."""
-        content = """
+# Main character the parser fills in when the section is missing or empty
+_DEFAULT_MAIN_CHARACTER = {"background": "unknown", "motivation": "adventure"}
+
+# Shared layout for the small fixtures; each test fills in only what it checks
+_STORY_TEMPLATE = """
 # Setting
-Location: Ankh-Morpork
-Time Period: Fantasy/Medieval
-Atmosphere: Bustling city
+Location: {location}
 
 # Main Character
-Name: Rincewind
-Background: Incompetent wizard
-Motivation: Survival and avoiding responsibility
-Personality: Cowardly but resourceful
+Name: {name}
 
 # Plot
-Rincewind must deliver an important message from the Unseen University to the Patrician's Palace, but various magical and mundane obstacles keep getting in his way. The message contains vital information about a brewing magical crisis.
+{plot}
 
 # NPCs
-- The Librarian: The orangutan librarian of Unseen University who provides cryptic assistance
-- Lord Vetinari: The Patrician of Ankh-Morpork, expecting the message
-- Luggage: Rincewind's magical travel chest with hundreds of little legs
-- Death: May appear if things go very wrong
+{npcs}
 
 # Branches
-- Diplomatic Approach: Try to use official channels and proper procedures
-- Sneaky Route: Attempt to avoid attention and sneak through back alleys
-- Magical Solution: Use unreliable magic to solve problems
-- Direct Confrontation: Face obstacles head-on despite being terrible at fighting
+{branches}
 
 # Technical Requirements
-Length: 8-12 story steps
-Branches: 3 major branching points
-Endings: 3 (success, failure, neutral)
-Complexity: Medium
-Target Audience: Fantasy fans
-Estimated Playtime: 15-20 minutes
+{requirements}
 """
-        
-        story = parse_story_file(content)
+
+
+def _story_content(
+    location: str = "Test",
+    name: str = "Hero",
+    plot: str = "Test plot.",
+    npcs: str = "- Helper: Test",
+    branches: str = "- Choice: Test",
+    requirements: str = "Length: 5",
+) -> str:
+    """Fill the shared story template with the given section values."""
+    return _STORY_TEMPLATE.format(
+        location=location,
+        name=name,
+        plot=plot,
+        npcs=npcs,
+        branches=branches,
+        requirements=requirements,
+    )
+
+
+_COMPLEX_NPCS = """\
+- Wizard: A powerful spellcaster with a long white beard and mysterious past
+- Guard Captain: Stern military leader, role: authority figure
+- Merchant Bob: Friendly trader who sells potions, role: helper, background: former adventurer
+- The Shadow: Mysterious antagonist, description: cloaked figure, role: villain"""
+
+_COMPLEX_BRANCHES = """\
+- Combat Approach: Use force to solve problems, type: aggressive, difficulty: hard
+- Diplomatic Route: Try to negotiate and find peaceful solutions
+- Stealth Path: Avoid detection and sneak past obstacles, type: sneaky
+- Magic Solution: Use magical abilities, requirements: magic skill"""
+
+_NUMERIC_REQUIREMENTS = """\
+Length: 12
+Branches: 4
+Endings: 3
+Complexity: 7
+Playtime: 20"""
+
+_MISSING_SECTIONS_STORY = """
+# Setting
+Location: Test City
+
+# Plot
+Simple plot without all sections.
+
+# Technical Requirements
+Length: 5
+"""
+
+_EMPTY_SECTIONS_STORY = """
+# Setting
+Location: Test City
+
+# Main Character
+
+# Plot
+Test plot.
+
+# NPCs
+
+# Branches
+
+# Technical Requirements
+Length: 5
+"""
+
+_SPECIAL_CHARACTERS_STORY = """
+# Setting
+Location: Café del Mañana
+Time Period: 21st-century
+
+# Main Character
+Name: José María
+Background: Ex-soldier with PTSD
+
+# Plot
+A story about redemption & hope—featuring José's journey through his past demons.
+
+# NPCs
+- Dr. Smith: Therapist with "unconventional" methods
+- María: José's ex-wife (50/50 custody)
+
+# Branches
+- Therapy Route: Professional help → healing
+- Self-medication: Alcohol/drugs path
+
+# Technical Requirements
+Length: 10-15 steps
+"""
+
+_MIXED_CASE_HEADERS_STORY = """
+# setting
+Location: Test
+
+# MAIN CHARACTER
+Name: Hero
+
+# plot
+Simple story.
+
+# npcs
+- Helper: Test
+
+# BRANCHES
+- Choice: Test
+
+# technical requirements
+Length: 5
+"""
+
+
+class TestStoryParser:
+    """Test the story file parsing functionality."""
+    
+    def test_parse_complete_story_file(self, complete_story_content):
+        """Test parsing a complete story file."""
+        story = parse_story_content(complete_story_content)
         
         assert isinstance(story, StoryRequirements)
         
@@ -69,43 +172,30 @@ Estimated Playtime: 15-20 minutes
         
         # Test NPCs
         assert len(story.npcs) == 4
-        librarian = next(npc for npc in story.npcs if npc["name"] == "The Librarian")
+        librarian = story.npcs_by_name["The Librarian"]
         assert librarian["description"] == "The orangutan librarian of Unseen University who provides cryptic assistance"
         
         # Test branches
         assert len(story.branches) == 4
-        diplomatic = next(branch for branch in story.branches if branch["type"] == "Diplomatic Approach")
+        diplomatic = story.branches_by_name["Diplomatic Approach"]
         assert "official channels" in diplomatic["description"]
         
         # Test technical requirements
-        assert story.technical_requirements["length"] == "8-12 story steps"
+        assert story.technical_requirements["length"] == 8
         assert story.technical_requirements["branches"] == "3 major branching points"
-        assert story.technical_requirements["endings"] == "3 (success, failure, neutral)"
+        assert story.technical_requirements["endings"] == 3
         assert story.technical_requirements["complexity"] == "Medium"
     
     def test_parse_minimal_story_file(self):
         """Test parsing a minimal story file."""
-        content = """
-# Setting
-Location: Test City
-
-# Main Character
-Name: Hero
-
-# Plot
-A simple test adventure.
-
-# NPCs
-- Merchant: Sells items
-
-# Branches
-- Choice 1: Go left or right
-
-# Technical Requirements
-Length: 5
-"""
+        content = _story_content(
+            location="Test City",
+            plot="A simple test adventure.",
+            npcs="- Merchant: Sells items",
+            branches="- Choice 1: Go left or right",
+        )
         
-        story = parse_story_file(content)
+        story = parse_story_content(content)
         
         assert isinstance(story, StoryRequirements)
         assert story.setting["location"] == "Test City"
@@ -113,33 +203,24 @@ Length: 5
         assert story.plot == "A simple test adventure."
         assert len(story.npcs) == 1
         assert len(story.branches) == 1
-        assert story.technical_requirements["length"] == "5"
+        assert story.technical_requirements["length"] == 5
     
     def test_parse_story_file_with_multiline_plot(self):
         """Test parsing story file with multiline plot."""
-        content = """
-# Setting
-Location: Fantasy World
-
-# Main Character
-Name: Adventurer
-
-# Plot
-This is a long plot description that spans multiple lines.
-It continues on the second line with more details about the story.
-And even a third line with additional plot elements.
-
-# NPCs
-- Guide: Helpful character
-
-# Branches
-- Path 1: First choice
-
-# Technical Requirements
-Length: 6
-"""
-        
-        story = parse_story_file(content)
+        content = _story_content(
+            location="Fantasy World",
+            name="Adventurer",
+            plot=(
+                "This is a long plot description that spans multiple lines.\n"
+                "It continues on the second line with more details about the story.\n"
+                "And even a third line with additional plot elements."
+            ),
+            npcs="- Guide: Helpful character",
+            branches="- Path 1: First choice",
+            requirements="Length: 6",
+        )
+        
+        story = parse_story_content(content)
         
         assert isinstance(story, StoryRequirements)
         assert "multiple lines" in story.plot
@@ -148,189 +229,91 @@ Length: 6
     
     def test_parse_story_file_with_complex_npcs(self):
         """Test parsing story file with complex NPC descriptions."""
-        content = """
-# Setting
-Location: Test
-
-# Main Character
-Name: Hero
-
-# Plot
-Simple plot.
-
-# NPCs
-- Wizard: A powerful spellcaster with a long white beard and mysterious past
-- Guard Captain: Stern military leader, role: authority figure
-- Merchant Bob: Friendly trader who sells potions, role: helper, background: former adventurer
-- The Shadow: Mysterious antagonist, description: cloaked figure, role: villain
-
-# Branches
-- Choice: Test choice
-
-# Technical Requirements
-Length: 5
-"""
+        content = _story_content(
+            plot="Simple plot.",
+            npcs=_COMPLEX_NPCS,
+            branches="- Choice: Test choice",
+        )
         
-        story = parse_story_file(content)
+        story = parse_story_content(content)
         
         assert len(story.npcs) == 4
         
-        wizard = next(npc for npc in story.npcs if npc["name"] == "Wizard")
+        wizard = story.npcs_by_name["Wizard"]
         assert "powerful spellcaster" in wizard["description"]
         
-        guard = next(npc for npc in story.npcs if npc["name"] == "Guard Captain")
+        guard = story.npcs_by_name["Guard Captain"]
         assert "Stern military leader" in guard["description"]
         assert guard.get("role") == "authority figure"
         
-        merchant = next(npc for npc in story.npcs if npc["name"] == "Merchant Bob")
+        merchant = story.npcs_by_name["Merchant Bob"]
         assert merchant.get("role") == "helper"
         assert merchant.get("background") == "former adventurer"
     
     def test_parse_story_file_with_complex_branches(self):
         """Test parsing story file with complex branch descriptions."""
-        content = """
-# Setting
-Location: Test
-
-# Main Character
-Name: Hero
-
-# Plot
-Test plot.
-
-# NPCs
-- Helper: Test helper
-
-# Branches
-- Combat Approach: Use force to solve problems, type: aggressive, difficulty: hard
-- Diplomatic Route: Try to negotiate and find peaceful solutions
-- Stealth Path: Avoid detection and sneak past obstacles, type: sneaky
-- Magic Solution: Use magical abilities, requirements: magic skill
-
-# Technical Requirements
-Length: 8
-"""
+        content = _story_content(
+            npcs="- Helper: Test helper",
+            branches=_COMPLEX_BRANCHES,
+            requirements="Length: 8",
+        )
         
-        story = parse_story_file(content)
+        story = parse_story_content(content)
         
         assert len(story.branches) == 4
         
-        combat = next(branch for branch in story.branches if branch["type"] == "Combat Approach")
+        combat = story.branches_by_name["Combat Approach"]
         assert "Use force" in combat["description"]
         assert combat.get("difficulty") == "hard"
         
-        stealth = next(branch for branch in story.branches if branch["type"] == "Stealth Path")
+        stealth = story.branches_by_name["Stealth Path"]
         assert stealth.get("type") == "sneaky"
     
     def test_parse_story_file_missing_sections(self):
         """Test parsing story file with missing sections."""
-        content = """
-# Setting
-Location: Test City
-
-# Plot
-Simple plot without all sections.
-
-# Technical Requirements
-Length: 5
-"""
+        content = _MISSING_SECTIONS_STORY
         
-        story = parse_story_file(content)
+        story = parse_story_content(content)
         
         assert isinstance(story, StoryRequirements)
         assert story.setting["location"] == "Test City"
         assert story.plot == "Simple plot without all sections."
-        assert len(story.main_character) == 0  # Missing section
+        assert story.main_character == _DEFAULT_MAIN_CHARACTER  # Missing section
         assert len(story.npcs) == 0  # Missing section
         assert len(story.branches) == 0  # Missing section
-        assert story.technical_requirements["length"] == "5"
+        assert story.technical_requirements["length"] == 5
     
     def test_parse_story_file_empty_sections(self):
         """Test parsing story file with empty sections."""
-        content = """
-# Setting
-Location: Test City
-
-# Main Character
-
-# Plot
-Test plot.
-
-# NPCs
-
-# Branches
-
-# Technical Requirements
-Length: 5
-"""
+        content = _EMPTY_SECTIONS_STORY
         
-        story = parse_story_file(content)
+        story = parse_story_content(content)
         
         assert isinstance(story, StoryRequirements)
         assert story.setting["location"] == "Test City"
-        assert len(story.main_character) == 0  # Empty section
+        assert story.main_character == _DEFAULT_MAIN_CHARACTER  # Empty section
         assert story.plot == "Test plot."
         assert len(story.npcs) == 0  # Empty section
         assert len(story.branches) == 0  # Empty section
     
     def test_parse_story_file_with_special_characters(self):
         """Test parsing story file with special characters."""
-        content = """
-# Setting
-Location: Café del Mañana
-Time Period: 21st-century
-
-# Main Character
-Name: José María
-Background: Ex-soldier with PTSD
-
-# Plot
-A story about redemption & hope—featuring José's journey through his past demons.
-
-# NPCs
-- Dr. Smith: Therapist with "unconventional" methods
-- María: José's ex-wife (50/50 custody)
-
-# Branches
-- Therapy Route: Professional help → healing
-- Self-medication: Alcohol/drugs path
-
-# Technical Requirements
-Length: 10-15 steps
-"""
+        content = _SPECIAL_CHARACTERS_STORY
         
-        story = parse_story_file(content)
+        story = parse_story_content(content)
         
         assert story.setting["location"] == "Café del Mañana"
         assert story.main_character["name"] == "José María"
         assert "redemption & hope—featuring" in story.plot
         
-        therapist = next(npc for npc in story.npcs if npc["name"] == "Dr. Smith")
+        therapist = story.npcs_by_name["Dr. Smith"]
         assert '"unconventional"' in therapist["description"]
     
     def test_parse_story_file_case_insensitive_headers(self):
         """Test parsing story file with mixed case headers."""
-        content = """
-# setting
-Location: Test
-
-# MAIN CHARACTER
-Name: Hero
-
-# plot
-Simple story.
-
-# npcs
-- Helper: Test
-
-# BRANCHES
-- Choice: Test
-
-# technical requirements
-Length: 5
-"""
+        content = _MIXED_CASE_HEADERS_STORY
         
-        story = parse_story_file(content)
+        story = parse_story_content(content)
         
         assert isinstance(story, StoryRequirements)
         assert story.setting["location"] == "Test"
@@ -339,48 +322,78 @@ Length: 5
     
     def test_parse_story_file_with_numeric_values(self):
         """Test parsing story file with numeric technical requirements."""
-        content = """
-# Setting
-Location: Test
-
-# Main Character
-Name: Hero
-
-# Plot
-Test plot.
-
-# NPCs
-- Helper: Test
-
-# Branches
-- Choice: Test
-
-# Technical Requirements
-Length: 12
-Branches: 4
-Endings: 3
-Complexity: 7
-Playtime: 20
-"""
+        content = _story_content(requirements=_NUMERIC_REQUIREMENTS)
         
-        story = parse_story_file(content)
+        story = parse_story_content(content)
         
-        assert story.technical_requirements["length"] == "12"
+        # Length and endings are read as numbers; other values stay text
+        assert story.technical_requirements["length"] == 12
         assert story.technical_requirements["branches"] == "4"
-        assert story.technical_requirements["endings"] == "3"
+        assert story.technical_requirements["endings"] == 3
         assert story.technical_requirements["complexity"] == "7"
         assert story.technical_requirements["playtime"] == "20"
     
     def test_parse_empty_story_file(self):
-        """Test parsing an empty story file."""
+        """Test that an empty story file falls back to the section defaults."""
         content = ""
         
-        story = parse_story_file(content)
+        story = parse_story_content(content)
         
         assert isinstance(story, StoryRequirements)
-        assert len(story.setting) == 0
-        assert len(story.main_character) == 0
-        assert story.plot == ""
+        assert story.setting == {"location": "unspecified", "time": "present day"}
+        assert story.main_character == _DEFAULT_MAIN_CHARACTER
+        assert story.plot == "A mysterious adventure unfolds."
         assert len(story.npcs) == 0
         assert len(story.branches) == 0
-        assert len(story.technical_requirements) == 0
\ No newline at end of file
+        assert story.technical_requirements == {"length": 10, "endings": 3}
+    
+    def test_parse_example_story_file(self):
+        """Test parsing a shipped example, which uses plain Key: value lines."""
+        story = parse_story_file(str(_EXAMPLES_DIR / "The_Color_Of_Magic_CYOA.story"))
+        
+        assert story.setting["location"] == "Ankh-Morpork and the Discworld"
+        assert story.setting["time"] == "Fantasy/Medieval with anachronisms"
+        assert story.main_character["name"] == "Rincewind"
+        assert story.main_character["background"] == "Incompetent wizard from Unseen University"
+        assert [npc["name"] for npc in story.npcs] == [
+            "Twoflower",
+            "The Luggage",
+            "Bravd and The Weasel",
+            "Fate and The Lady Who Must Not Be Named",
+        ]
+        assert [branch["name"] for branch in story.branches] == [
+            "Cowardly Approach",
+            "Reluctant Heroism",
+            "Tourist Guide",
+        ]
+        assert story.technical_requirements["length"] == 10
+        assert story.technical_requirements["endings"] == 3
+    
+    def test_parse_story_content_returns_independent_models(self):
+        """Test that mutating a parsed story does not leak into the next parse."""
+        content = _story_content(npcs="- Merchant: Sells items")
+        
+        story = parse_story_content(content)
+        story.setting["location"] = "Changed"
+        story.npcs[0]["description"] = "Changed"
+        story.technical_requirements["length"] = 99
+        
+        reparsed = parse_story_content(content)
+        
+        assert reparsed is not story
+        assert reparsed.setting["location"] == "Test"
+        assert reparsed.npcs[0]["description"] == "Sells items"
+        assert reparsed.technical_requirements["length"] == 5
+    
+    def test_name_indexes_skip_nameless_entries(self):
+        """Test that NPCs and branches without a name are left out of the indexes."""
+        story = StoryRequirements(
+            setting={"location": "Test"},
+            main_character={"name": "Hero"},
+            plot="A simple test adventure.",
+            npcs=[{"name": "Merchant", "description": "Sells items"}, {"description": "Nameless"}],
+            branches=[{"name": "", "description": "Blank"}, {"name": "Left", "description": "Go left"}],
+        )
+        
+        assert list(story.npcs_by_name) == ["Merchant"]
+        assert list(story.branches_by_name) == ["Left"]
@@ -13,101 +13,118 @@ from adventure_agent.tools.choice_analyzer import (
 from adventure_agent.models import AdventureGame, Choice, ChoiceLabel, StoryStep
 
 
+def _make_adventure(choices, name, narrative, endings):
+    """Build a single-step adventure around the given choices."""
+    step = StoryStep(step_id="1", narrative=narrative, choices=choices)
+    return AdventureGame(
+        game_name=name,
+        main_menu=["Start"],
+        steps={"1": step},
+        endings=endings,
+        inventory={},
+        stats={},
+        variables={},
+    )
+
+
+@pytest.fixture(scope="session")
+def simple_adventure():
+    """Create a simple adventure shared by tests that only read it."""
+    choice1 = Choice(
+        label=ChoiceLabel.A,
+        description="Fight the dragon with your sword",
+        target="ENDING_SUCCESS",
+        conditions=["IF stats.combat >= 50"],
+        consequences=["USE health -20", "SET reputation +10"]
+    )
+    
+    choice2 = Choice(
+        label=ChoiceLabel.B,
+        description="Try to negotiate with the dragon",
+        target="ENDING_NEUTRAL",
+        conditions=["IF stats.charisma >= 60"],
+        consequences=["SET diplomacy_skill +5"]
+    )
+    
+    choice3 = Choice(
+        label=ChoiceLabel.C,
+        description="Run away from the dragon",
+        target="ENDING_FAILURE",
+        conditions=[],
+        consequences=["SET reputation -5"]
+    )
+    
+    step = StoryStep(
+        step_id="1",
+        narrative="A massive dragon blocks your path. What do you do?",
+        choices=[choice1, choice2, choice3]
+    )
+    
+    return AdventureGame(
+        game_name="Dragon Encounter",
+        main_menu=["Start"],
+        steps={"1": step},
+        endings={
+            "success": "You defeated the dragon!",
+            "neutral": "You reached an understanding with the dragon.",
+            "failure": "You fled in terror."
+        },
+        inventory={},
+        stats={},
+        variables={}
+    )
+
+
+@pytest.fixture(scope="session")
+def poor_choice_adventure():
+    """Create an adventure with poor choices shared by tests that only read it."""
+    # All choices have same target and similar descriptions
+    choice1 = Choice(
+        label=ChoiceLabel.A,
+        description="Go ahead",
+        target="ENDING_SUCCESS",
+        conditions=[],
+        consequences=[]
+    )
+    
+    choice2 = Choice(
+        label=ChoiceLabel.B,
+        description="Go forward",
+        target="ENDING_SUCCESS",
+        conditions=[],
+        consequences=[]
+    )
+    
+    choice3 = Choice(
+        label=ChoiceLabel.C,
+        description="Move ahead",
+        target="ENDING_SUCCESS",
+        conditions=[],
+        consequences=[]
+    )
+    
+    step = StoryStep(
+        step_id="1",
+        narrative="You face a choice at the end of a long, featureless corridor.",
+        choices=[choice1, choice2, choice3]
+    )
+    
+    return AdventureGame(
+        game_name="Poor Choices",
+        main_menu=["Start"],
+        steps={"1": step},
+        endings={"success": "Done."},
+        inventory={},
+        stats={},
+        variables={}
+    )
+
+
 class TestChoiceAnalyzer:
     """Test the choice analysis functionality."""
     
-    @pytest.fixture
-    def simple_adventure(self):
-        """Create a simple adventure for testing."""
-        choice1 = Choice(
-            label=ChoiceLabel.A,
-            description="Fight the dragon with your sword",
-            target="ENDING_SUCCESS",
-            conditions=["IF stats.combat >= 50"],
-            consequences=["USE health -20", "SET reputation +10"]
-        )
-        
-        choice2 = Choice(
-            label=ChoiceLabel.B,
-            description="Try to negotiate with the dragon",
-            target="ENDING_NEUTRAL",
-            conditions=["IF stats.charisma >= 60"],
-            consequences=["SET diplomacy_skill +5"]
-        )
-        
-        choice3 = Choice(
-            label=ChoiceLabel.C,
-            description="Run away from the dragon",
-            target="ENDING_FAILURE",
-            conditions=[],
-            consequences=["SET reputation -5"]
-        )
-        
-        step = StoryStep(
-            step_id="1",
-            narrative="A massive dragon blocks your path. What do you do?",
-            choices=[choice1, choice2, choice3]
-        )
-        
-        return AdventureGame(
-            game_name="Dragon Encounter",
-            main_menu=["Start"],
-            steps={"1": step},
-            endings={
-                "success": "You defeated the dragon!",
-                "neutral": "You reached an understanding with the dragon.",
-                "failure": "You fled in terror."
-            },
-            inventory={},
-            stats={},
-            variables={}
-        )
+    pytestmark = pytest.mark.asyncio(loop_scope="module")
     
-    @pytest.fixture
-    def poor_choice_adventure(self):
-        """Create an adventure with poor choices for testing."""
-        # All choices have same target and similar descriptions
-        choice1 = Choice(
-            label=ChoiceLabel.A,
-            description="Go",
-            target="ENDING_SUCCESS",
-            conditions=[],
-            consequences=[]
-        )
-        
-        choice2 = Choice(
-            label=ChoiceLabel.B,
-            description="Go forward",
-            target="ENDING_SUCCESS",
-            conditions=[],
-            consequences=[]
-        )
-        
-        choice3 = Choice(
-            label=ChoiceLabel.C,
-            description="Move ahead",
-            target="ENDING_SUCCESS",
-            conditions=[],
-            consequences=[]
-        )
-        
-        step = StoryStep(
-            step_id="1",
-            narrative="You face a choice.",
-            choices=[choice1, choice2, choice3]
-        )
-        
-        return AdventureGame(
-            game_name="Poor Choices",
-            main_menu=["Start"],
-            steps={"1": step},
-            endings={"success": "Done."},
-            inventory={},
-            stats={},
-            variables={}
-        )
-    
-    @pytest.mark.asyncio
     async def test_analyze_choices_good_adventure(self, simple_adventure):
         """Test choice analysis on a well-designed adventure."""
         result = await analyze_choices(simple_adventure)
@@ -129,7 +146,6 @@ class TestChoiceAnalyzer:
         for score in analysis.choice_impact_scores.values():
             assert score > 0.0
     
-    @pytest.mark.asyncio
     async def test_analyze_choices_poor_adventure(self, poor_choice_adventure):
         """Test choice analysis on a poorly designed adventure."""
         result = await analyze_choices(poor_choice_adventure)
@@ -149,65 +165,6 @@ class TestChoiceAnalyzer:
         issue_types = [issue.issue_type for issue in issues]
         assert "IDENTICAL_CHOICE_TARGETS" in issue_types
     
-    def test_calculate_choice_impact_scores(self, simple_adventure):
-        """Test calculation of choice impact scores."""
-        scores = _calculate_choice_impact_scores(simple_adventure)
-        
-        assert len(scores) == 3
-        
-        # All scores should be between 0 and 1
-        for score in scores.values():
-            assert 0.0 <= score <= 1.0
-        
-        # Choices with consequences should have higher impact
-        choice_keys = list(scores.keys())
-        # First choice has most consequences and conditions
-        first_choice_key = choice_keys[0]
-        last_choice_key = choice_keys[-1]
-        
-        # Choice with conditions and consequences should have higher impact
-        assert scores[first_choice_key] > scores[last_choice_key]
-    
-    def test_calculate_choice_differentiation(self, simple_adventure):
-        """Test calculation of choice differentiation."""
-        differentiation = _calculate_choice_differentiation(simple_adventure)
-        
-        assert len(differentiation) == 3
-        
-        # All scores should be between 0 and 1
-        for score in differentiation.values():
-            assert 0.0 <= score <= 1.0
-        
-        # Choices with different targets should be well differentiated
-        for score in differentiation.values():
-            assert score > 0.3  # Should be reasonably different
-    
-    def test_calculate_choice_differentiation_poor(self, poor_choice_adventure):
-        """Test differentiation calculation on poorly differentiated choices."""
-        differentiation = _calculate_choice_differentiation(poor_choice_adventure)
-        
-        # Should detect poor differentiation
-        for score in differentiation.values():
-            assert score < 0.8  # Similar choices should have low differentiation
-    
-    def test_calculate_text_similarity(self):
-        """Test text similarity calculation."""
-        # Identical texts
-        assert _calculate_text_similarity("hello world", "hello world") == 1.0
-        
-        # Completely different texts
-        similarity = _calculate_text_similarity("hello world", "goodbye universe")
-        assert similarity < 0.5
-        
-        # Similar texts
-        similarity = _calculate_text_similarity("fight the dragon", "battle the dragon")
-        assert similarity > 0.5
-        
-        # Empty texts
-        assert _calculate_text_similarity("", "") == 1.0
-        assert _calculate_text_similarity("hello", "") == 0.0
-    
-    @pytest.mark.asyncio
     async def test_choice_analyzer_with_single_choice(self):
         """Test choice analyzer with a step that has only one choice."""
         single_choice = Choice(
@@ -218,20 +175,11 @@ class TestChoiceAnalyzer:
             consequences=[]
         )
         
-        step = StoryStep(
-            step_id="1",
-            narrative="You have no choice but to continue.",
-            choices=[single_choice]
-        )
-        
-        adventure = AdventureGame(
-            game_name="Linear Adventure",
-            main_menu=["Start"],
-            steps={"1": step},
+        adventure = _make_adventure(
+            [single_choice],
+            name="Linear Adventure",
+            narrative="The corridor behind you has collapsed, so you have no choice but to continue.",
             endings={"success": "You made it!"},
-            inventory={},
-            stats={},
-            variables={}
         )
         
         result = await analyze_choices(adventure)
@@ -240,18 +188,16 @@ class TestChoiceAnalyzer:
         analysis = result.data["analysis"]
         
         # Single choice should have neutral differentiation score
-        differentiation_scores = list(analysis.choice_differentiation.values())
-        assert differentiation_scores[0] == 0.5  # Neutral score for single choice
+        assert analysis.choice_differentiation["STEP_1.CHOICE_1"] == 0.5
     
-    @pytest.mark.asyncio
     async def test_choice_analyzer_with_no_choices(self):
         """Test choice analyzer with a step that has no choices."""
-        step = StoryStep(
-            step_id="1", 
+        # Steps need at least one choice, so this step skips validation
+        step = StoryStep.model_construct(
+            step_id="1",
             narrative="The adventure ends here.",
             choices=[]
         )
-        
         adventure = AdventureGame(
             game_name="No Choice Adventure",
             main_menu=["Start"],
@@ -272,7 +218,6 @@ class TestChoiceAnalyzer:
         assert len(analysis.choice_differentiation) == 0
         assert analysis.player_agency_score >= 0.0
     
-    @pytest.mark.asyncio
     async def test_suggest_choice_improvements(self, poor_choice_adventure):
         """Test choice improvement suggestions."""
         suggestions = await suggest_choice_improvements(poor_choice_adventure)
@@ -283,51 +228,53 @@ class TestChoiceAnalyzer:
         suggestion_text = " ".join(suggestions).lower()
         assert "target" in suggestion_text or "path" in suggestion_text
     
-    @pytest.mark.asyncio
-    async def test_choice_analyzer_empty_descriptions(self):
-        """Test choice analyzer with empty choice descriptions."""
-        choice1 = Choice(
-            label=ChoiceLabel.A,
-            description="",  # Empty description
-            target="ENDING_SUCCESS",
-            conditions=[],
-            consequences=[]
-        )
-        
-        choice2 = Choice(
-            label=ChoiceLabel.B,
-            description="Go",  # Very short description
-            target="ENDING_FAILURE",
-            conditions=[],
-            consequences=[]
-        )
-        
-        step = StoryStep(
-            step_id="1",
-            narrative="Choose your path.",
-            choices=[choice1, choice2]
-        )
-        
-        adventure = AdventureGame(
-            game_name="Empty Descriptions",
-            main_menu=["Start"],
-            steps={"1": step},
-            endings={"success": "Win", "failure": "Lose"},
-            inventory={},
-            stats={},
-            variables={}
+    @pytest.mark.parametrize(
+        "descriptions",
+        [
+            ["", "Go"],
+            ["   ", "Open the door"],
+            ["Walk", "Climb"],
+            ["  Run  ", "Hide behind the crates"],
+            ["Climb", "Sneak past"],
+            ["Abcd", "Abcde", "", "Wait here"],
+        ],
+        ids=["empty", "whitespace", "one_short", "padded_short", "boundary", "mixed"],
+    )
+    async def test_choice_analyzer_short_descriptions(self, descriptions):
+        """Test that exactly the choices with under 5 non-blank chars are flagged."""
+        # Descriptions under 5 chars are invalid, so choices skip validation
+        choices = [
+            Choice.model_construct(
+                label=label,
+                description=description,
+                target="ENDING_SUCCESS",
+                conditions=[],
+                consequences=[]
+            )
+            for label, description in zip(ChoiceLabel, descriptions)
+        ]
+        adventure = _make_adventure(
+            choices,
+            name="Short Descriptions",
+            narrative="Several paths lead away from the camp. Choose your path.",
+            endings={"success": "Win"},
         )
         
         result = await analyze_choices(adventure)
         
         assert result.success
-        
-        # Should identify issues with short/empty descriptions
-        issues = result.data["issues"]
-        issue_types = [issue.issue_type for issue in issues]
-        assert "TOO_SHORT_DESCRIPTION" in issue_types
+        flagged = {
+            issue.location
+            for issue in result.data["issues"]
+            if issue.issue_type == "TOO_SHORT_DESCRIPTION"
+        }
+        expected = {
+            f"STEP_1.CHOICE_{i}"
+            for i, description in enumerate(descriptions, 1)
+            if len(description.strip()) < 5
+        }
+        assert flagged == expected
     
-    @pytest.mark.asyncio
     async def test_choice_analyzer_high_impact_choices(self):
         """Test choice analyzer with high-impact choices."""
         high_impact_choice = Choice(
@@ -343,20 +290,11 @@ class TestChoiceAnalyzer:
             ]
         )
         
-        step = StoryStep(
-            step_id="1",
+        adventure = _make_adventure(
+            [high_impact_choice],
+            name="High Impact",
             narrative="You face the most important decision of your life.",
-            choices=[high_impact_choice]
-        )
-        
-        adventure = AdventureGame(
-            game_name="High Impact",
-            main_menu=["Start"],
-            steps={"1": step},
             endings={"success": "Great choice!"},
-            inventory={},
-            stats={},
-            variables={}
         )
         
         result = await analyze_choices(adventure)
@@ -365,10 +303,8 @@ class TestChoiceAnalyzer:
         analysis = result.data["analysis"]
         
         # High-impact choice should have high impact score
-        impact_scores = list(analysis.choice_impact_scores.values())
-        assert impact_scores[0] > 0.7  # Should be high impact
+        assert analysis.choice_impact_scores["STEP_1.CHOICE_1"] >= 0.7
     
-    @pytest.mark.asyncio
     async def test_choice_consistency_analysis(self):
         """Test analysis of choice-consequence consistency."""
         # Inconsistent choice - dangerous action that increases health
@@ -388,28 +324,77 @@ class TestChoiceAnalyzer:
             consequences=["USE stamina -10"]  # Consistent
         )
         
-        step = StoryStep(
-            step_id="1",
-            narrative="You need to get down from this cliff.",
-            choices=[inconsistent_choice, consistent_choice]
-        )
-        
-        adventure = AdventureGame(
-            game_name="Consistency Test",
-            main_menu=["Start"],
-            steps={"1": step},
+        adventure = _make_adventure(
+            [inconsistent_choice, consistent_choice],
+            name="Consistency Test",
+            narrative="You are stranded on a narrow ledge and need to get down from this cliff.",
             endings={"success": "You made it down!"},
-            inventory={},
-            stats={},
-            variables={}
         )
         
         result = await analyze_choices(adventure)
         
         assert result.success
         
-        # Should detect inconsistency issues
-        issues = result.data["issues"]
-        issue_types = [issue.issue_type for issue in issues]
-        # Note: Our current implementation might not catch this specific inconsistency
-        # but the test demonstrates how we could extend it
\ No newline at end of file
+        # The mismatched consequence lowers the choice's consistency score
+        consistency = result.data["analysis"].consequence_consistency
+        assert consistency["STEP_1.CHOICE_1"] < consistency["STEP_1.CHOICE_2"]
+        
+        # One mismatch stays above the issue threshold, so only the shared
+        # target is reported
+        issue_types = [issue.issue_type for issue in result.data["issues"]]
+        assert "INCONSISTENT_CONSEQUENCES" not in issue_types
+        assert "IDENTICAL_CHOICE_TARGETS" in issue_types
+
+
+class TestChoiceScoring:
+    """Test the choice scoring helpers directly."""
+    
+    def test_calculate_choice_impact_scores(self, simple_adventure):
+        """Test calculation of choice impact scores."""
+        scores = _calculate_choice_impact_scores(simple_adventure)
+        
+        assert len(scores) == 3
+        
+        # All scores should be between 0 and 1
+        for score in scores.values():
+            assert 0.0 <= score <= 1.0
+        
+        # First choice has most consequences and conditions, so higher impact
+        assert scores["STEP_1.CHOICE_1"] > scores["STEP_1.CHOICE_3"]
+    
+    def test_calculate_choice_differentiation(self, simple_adventure):
+        """Test calculation of choice differentiation."""
+        differentiation = _calculate_choice_differentiation(simple_adventure)
+        
+        assert len(differentiation) == 3
+        
+        # All scores should be between 0 and 1
+        for score in differentiation.values():
+            assert 0.0 <= score <= 1.0
+        
+        # Choices with different targets should be well differentiated
+        for score in differentiation.values():
+            assert score > 0.3  # Should be reasonably different
+    
+    def test_calculate_choice_differentiation_poor(self, poor_choice_adventure):
+        """Test differentiation calculation on poorly differentiated choices."""
+        differentiation = _calculate_choice_differentiation(poor_choice_adventure)
+        
+        # Should detect poor differentiation
+        for score in differentiation.values():
+            assert score < 0.8  # Similar choices should have low differentiation
+    
+    @pytest.mark.parametrize(
+        "text1,text2,check",
+        [
+            ("hello world", "hello world", lambda similarity: similarity == 1.0),
+            ("hello world", "goodbye universe", lambda similarity: similarity < 0.5),
+            ("fight the dragon", "battle the dragon", lambda similarity: similarity >= 0.5),
+            ("", "", lambda similarity: similarity == 1.0),
+            ("hello", "", lambda similarity: similarity == 0.0),
+        ],
+        ids=["identical", "different", "similar", "both_empty", "one_empty"],
+    )
+    def test_calculate_text_similarity(self, text1, text2, check):
+        """Test text similarity calculation."""
+        assert check(_calculate_text_similarity(text1, text2))
\ No newline at end of file
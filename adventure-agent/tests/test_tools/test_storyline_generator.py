@@ -0,0 +1,190 @@
+"""
+Tests for the storyline generator tool.
+"""
+
+import asyncio
+
+import pytest
+
+from adventure_agent.models import (
+    AdventureGame,
+    AuthorPersona,
+    Choice,
+    StoryRequirements,
+    StoryStep,
+    ToolResult,
+)
+from adventure_agent.tools import storyline_generator
+from adventure_agent.tools.storyline_generator import generate_storyline
+
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+
+@pytest.fixture
+def author():
+    """Create a minimal author persona."""
+    return AuthorPersona(
+        voice_and_tone=["witty"],
+        narrative_style=["descriptive"],
+        world_elements=["fantasy"],
+        character_development=["growth"],
+        themes=["friendship"],
+    )
+
+
+@pytest.fixture
+def story():
+    """Create minimal story requirements."""
+    return StoryRequirements(
+        setting={"location": "Ankh-Morpork"},
+        main_character={"background": "wizard"},
+        plot="A wizard must deliver a message.",
+    )
+
+
+def adventure_with(step_count):
+    """Build an adventure snapshot with the given number of steps."""
+    return AdventureGame(
+        game_name="Streamed Adventure",
+        steps={
+            str(i): StoryStep(
+                step_id=str(i),
+                narrative="The wizard walks on through the crowded streets of the city.",
+                choices=[Choice(label="A", description="Keep walking", target="ENDING_SUCCESS")],
+            )
+            for i in range(1, step_count + 1)
+        },
+    )
+
+
+class TestGenerateStoryline:
+    """Test deduplication of concurrent storyline requests."""
+    
+    @pytest.fixture
+    def runs(self, monkeypatch):
+        """Replace model runs with ones that block until given a result."""
+        runs: list[asyncio.Future[ToolResult]] = []
+        
+        async def fake_generate_storyline(author, story, step_range, limiter, on_partial):
+            run = asyncio.get_running_loop().create_future()
+            runs.append(run)
+            return await run
+        
+        monkeypatch.setattr(storyline_generator, "_generate_storyline", fake_generate_storyline)
+        return runs
+    
+    async def test_waiter_shares_owner_result(self, author, story, runs):
+        """Test that a concurrent identical request reuses the running one."""
+        owner = asyncio.create_task(generate_storyline(author, story))
+        waiter = asyncio.create_task(generate_storyline(author, story))
+        await asyncio.sleep(0)
+        
+        runs[0].set_result(ToolResult(success=True, message="shared"))
+        
+        assert (await owner).message == "shared"
+        assert (await waiter).message == "shared"
+        assert len(runs) == 1
+    
+    async def test_waiter_restarts_when_owner_cancelled(self, author, story, runs):
+        """Test that cancelling the owner does not cancel requests waiting on it."""
+        owner = asyncio.create_task(generate_storyline(author, story))
+        waiter = asyncio.create_task(generate_storyline(author, story))
+        await asyncio.sleep(0)
+        
+        owner.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+        
+        # The waiter starts a run of its own instead of inheriting the cancellation
+        await asyncio.sleep(0)
+        assert len(runs) == 2
+        runs[1].set_result(ToolResult(success=True, message="restarted"))
+        
+        assert (await waiter).message == "restarted"
+        assert not storyline_generator._inflight
+    
+    async def test_cancelled_waiter_leaves_owner_running(self, author, story, runs):
+        """Test that cancelling a waiter does not cancel the shared run."""
+        owner = asyncio.create_task(generate_storyline(author, story))
+        waiter = asyncio.create_task(generate_storyline(author, story))
+        await asyncio.sleep(0)
+        
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        
+        runs[0].set_result(ToolResult(success=True, message="owner"))
+        
+        assert (await owner).message == "owner"
+
+
+class StubStreamedRun:
+    """Streamed agent run that yields growing snapshots, then the final adventure."""
+    
+    def __init__(self, release):
+        self.release = release
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        return False
+    
+    async def stream(self):
+        yield adventure_with(1)
+        await self.release.wait()
+        yield adventure_with(2)
+    
+    async def get_output(self):
+        return adventure_with(3)
+
+
+class StubAgent:
+    """Agent that records its streamed runs."""
+    
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.stream_calls = 0
+    
+    def run_stream(self, prompt, deps):
+        self.stream_calls += 1
+        return StubStreamedRun(self.release)
+
+
+class TestStreamStoryline:
+    """Test streaming storyline generation through generate_storyline."""
+    
+    @pytest.fixture
+    def agent(self, monkeypatch):
+        """Replace the storyline agent with a stub."""
+        agent = StubAgent()
+        monkeypatch.setattr(storyline_generator, "_storyline_agent", lambda: agent)
+        return agent
+    
+    async def test_partials_reach_callback_in_order(self, author, story, agent):
+        """Test that each streamed snapshot is passed on before the final result."""
+        agent.release.set()
+        drafted = []
+        
+        result = await generate_storyline(
+            author, story, on_partial=lambda partial: drafted.append(len(partial.steps))
+        )
+        
+        assert result.success
+        assert drafted == [1, 2]
+        assert len(result.data.steps) == 3
+    
+    async def test_concurrent_streams_share_one_run(self, author, story, agent):
+        """Test that an identical streaming request joins the one in flight."""
+        drafted = []
+        owner = asyncio.create_task(
+            generate_storyline(author, story, on_partial=lambda partial: drafted.append(len(partial.steps)))
+        )
+        waiter = asyncio.create_task(generate_storyline(author, story, on_partial=drafted.append))
+        await asyncio.sleep(0)
+        agent.release.set()
+        
+        assert len((await owner).data.steps) == 3
+        assert len((await waiter).data.steps) == 3
+        assert agent.stream_calls == 1
+        assert drafted == [1, 2]
@@ -0,0 +1,96 @@
+"""
+Tests for the validate_imports script.
+"""
+
+import sys
+
+import pytest
+
+import validate_imports
+
+# A module table that imports only the models, so no optional dependency is needed
+_MODELS_ONLY = (
+    ("Models", (
+        ("adventure_agent.models", ("AdventureGame",)),
+    )),
+)
+
+
+@pytest.fixture
+def cache_file(tmp_path, monkeypatch):
+    """Point the success cache at a temporary file and check only the models."""
+    path = tmp_path / "validate.json"
+    monkeypatch.setattr(validate_imports, "CACHE_FILE", str(path))
+    monkeypatch.setattr(validate_imports, "MODULES", _MODELS_ONLY)
+    return path
+
+
+class TestCache:
+    """Test the opt-in success cache."""
+    
+    def test_second_run_is_served_from_cache(self, cache_file, capsys):
+        """Test that a repeat run with unchanged sources imports nothing."""
+        assert validate_imports.test_imports(use_cache=True)
+        assert cache_file.exists()
+        assert "(cached)" not in capsys.readouterr().out
+        
+        assert validate_imports.test_imports(use_cache=True)
+        assert "(cached)" in capsys.readouterr().out
+    
+    def test_cache_is_ignored_without_flag(self, cache_file, capsys):
+        """Test that the default run neither writes nor reads the cache."""
+        assert validate_imports.test_imports()
+        assert not cache_file.exists()
+        
+        validate_imports.test_imports(use_cache=True)
+        capsys.readouterr()
+        assert validate_imports.test_imports()
+        assert "(cached)" not in capsys.readouterr().out
+    
+    def test_cache_is_keyed_by_mode(self, cache_file, capsys):
+        """Test that a deep run does not reuse a shallow run's success."""
+        validate_imports.test_imports(use_cache=True)
+        capsys.readouterr()
+        
+        assert validate_imports.test_imports(use_cache=True, deep=True)
+        assert "(cached)" not in capsys.readouterr().out
+    
+    def test_failed_run_is_not_cached(self, cache_file, monkeypatch):
+        """Test that only successful runs are recorded."""
+        monkeypatch.setattr(validate_imports, "MODULES", (
+            ("Models", (("adventure_agent.models", ("NoSuchModel",)),)),
+        ))
+        
+        assert not validate_imports.test_imports(use_cache=True)
+        assert not cache_file.exists()
+
+
+class TestFastMode:
+    """Test the --fast mode, which locates modules without importing them."""
+    
+    def test_locates_every_module(self, capsys):
+        """Test that the real module table is found, including the CLI."""
+        assert validate_imports.main(["--fast"]) == 0
+        
+        out = capsys.readouterr().out
+        assert "CLI found (fast mode)" in out
+        assert "All imports successful" in out
+    
+    def test_does_not_import_modules(self, monkeypatch):
+        """Test that a located module is not executed."""
+        monkeypatch.delitem(sys.modules, "adventure_agent.tools.choice_analyzer", raising=False)
+        monkeypatch.setattr(validate_imports, "MODULES", (
+            ("Tools", (("adventure_agent.tools.choice_analyzer", ("analyze_choices",)),)),
+        ))
+        
+        assert validate_imports.test_imports(fast=True)
+        assert "adventure_agent.tools.choice_analyzer" not in sys.modules
+    
+    def test_reports_missing_module(self, monkeypatch, capsys):
+        """Test that a module that cannot be found fails the check."""
+        monkeypatch.setattr(validate_imports, "MODULES", (
+            ("Tools", (("adventure_agent.tools.no_such_tool", ()),)),
+        ))
+        
+        assert validate_imports.main(["--fast"]) == 1
+        assert "No module named 'adventure_agent.tools.no_such_tool'" in capsys.readouterr().out